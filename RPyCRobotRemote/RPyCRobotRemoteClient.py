@@ -1,77 +1,336 @@
 """
 Client Implementation for RPyCRobotRemote
 """
+# pylint: disable=too-many-lines
 import sys
 import functools
+import pathlib
+import re
 import logging
-from typing import Callable
+import inspect
+import pickle
+import itertools
+import json
+import time
+import warnings
+from datetime import datetime
+from typing import Callable, Optional
+from concurrent.futures import Future
 from contextlib import contextmanager
-from threading import current_thread, _register_atexit as register_atexit
+from threading import (
+    Event,
+    Lock,
+    Thread,
+    current_thread,
+    _register_atexit as register_atexit,
+)
 import rpyc
+from rpyc.core import brine, consts, vinegar
 from rpyc.core.protocol import Connection
-from robot.libraries.DateTime import convert_time
+from rpyc.core.stream import SocketStream
+from rpyc.lib import Timeout
+from rpyc.utils.factory import connect_channel
 from robot.api import logger as robotapilogger
 from robot.api.deco import not_keyword
+from robot.api.parsing import ModelVisitor, get_model
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+from robot.utils import (
+    is_truthy,
+    normalize,
+    secs_to_timestr,
+    timestr_to_secs,
+)
 from robot.output import LOGGER
+from robot.version import VERSION as ROBOT_VERSION
 from robot.output.librarylogger import LOGGING_THREADS
+from robot.output.loggerhelper import Message
 try:
     from robot.output.loggerapi import LoggerApi
 except ImportError:
     LoggerApi = None
+from .RPyCRobotRemoteCompression import CODECS, CompressingChannel
+from .RPyCRobotRemoteDispatcher import dispatcher
+from .RPyCRobotRemoteKeywords import (
+    convertible_type_name,
+    keyword_specification,
+)
+from .RPyCRobotRemotePool import connection_pool as default_pool
+from .RPyCRobotRemoteSerializer import (
+    Serializer,
+    NotSerializable,
+    serializer as default_serializer,
+)
+from .RPyCRobotRemoteSharedMemory import (
+    SHARED_MEMORY,
+    SharedMemoryTransfer,
+    receive as receive_shared_memory,
+    shareable,
+)
 
 log = logging.getLogger('RPyCRobotRemote.Client')
 log.setLevel(logging.INFO)
 del log
 
+UNDEFINED = object()
+
+# keywords with this tag get their arguments passed by value
+ARGUMENTS_BY_VALUE_TAG = 'rpyc:arguments-by-value'
+
+# ``by_value`` of keyword results handed out by a remote ``ResultStream``
+STREAM = 'stream'
+
+# first and maximum delay between attempts to reconnect, in seconds
+RECONNECT_DELAY = 0.05
+RECONNECT_MAX_DELAY = 2.0
+# connections unused for this many seconds are pinged before a call
+PING_IDLE_TIME = 1.0
+PING_TIMEOUT = 1.0
+
+# names under which the client is imported as library
+LIBRARY_NAMES = frozenset((
+    'RPyCRobotRemote',
+    'RPyCRobotRemote.Client',
+    'RPyCRobotRemote.RPyCRobotRemote',
+    'RPyCRobotRemote.RPyCRobotRemoteClient',
+    'RPyCRobotRemote.RPyCRobotRemoteClient.RPyCRobotRemoteClient',
+))
+
+# connections started in the background before their library is created,
+# by the key of their settings
+_background_connections = {}
+_background_lock = Lock()
+_background_suite = None  # pylint: disable=C0103
+# initialization files of suite directories parsed for their imports
+SUITE_INIT_SUFFIXES = ('.robot', '.txt', '.tsv', '.rst', '.rest')
+
+# ``console`` argument of Message is only available with Robot 7.4 or newer
+MESSAGE_HAS_CONSOLE = tuple(
+    int(part) for part in re.match(r'(\d+)\.(\d+)', ROBOT_VERSION).groups()
+) >= (7, 4)
+
+
+def replay_log_messages(records):
+    """
+    Replays ``robot.api.logger`` messages and output which were collected
+    by the other party, keeping the original timestamps of messages
+    """
+    for kind, timestamp, args in records:
+        if kind == 'console':
+            robotapilogger.console(*args)
+        elif kind in ('stdout', 'stderr'):
+            getattr(sys, kind).write(*args)
+        elif current_thread().name in LOGGING_THREADS:
+            msg, level, html, console = args
+            if MESSAGE_HAS_CONSOLE:
+                message = Message(msg, level, html, console=console)
+            else:
+                message = Message(msg, level, html)
+            timestamp = datetime.fromtimestamp(timestamp)
+            if isinstance(message.timestamp, str):
+                # Robot Framework before 7.0 uses formatted timestamps
+                timestamp = timestamp.strftime('%Y%m%d %H:%M:%S.%f')[:-3]
+            message.timestamp = timestamp
+            LOGGER.log_message(message)
+            if not MESSAGE_HAS_CONSOLE and (
+                    console or level.upper() == 'CONSOLE'):
+                # Robot Framework before 7.4 writes to the console only in
+                # robot.api.logger itself, not when logging the message
+                robotapilogger.console(msg)
+
+
+class StartedKeyword:  # pylint: disable=R0903
+    """keyword started on the remote, which reports its outcome to ``done``"""
+
+    __slots__ = ('name', 'finished', 'outcome')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.finished = Event()
+        self.outcome = None
+
+    def done(self, passed: bool, outcome, output):
+        """called by the remote once the keyword finished"""
+        self.outcome = (passed, outcome, output)
+        self.finished.set()
+
+
+class CallStatistics:  # pylint: disable=R0903
+    """counters of the messages exchanged over a connection"""
+
+    __slots__ = ('requests', 'callbacks', 'bytes_sent', 'bytes_received',
+                 'wire_bytes_sent', 'wire_bytes_received', 'redirect_time')
+
+    def __init__(self):
+        self.requests = 0
+        self.callbacks = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.wire_bytes_sent = 0
+        self.wire_bytes_received = 0
+        self.redirect_time = 0.0
+
+    def snapshot(self):
+        """return the current value of all counters"""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+
+class MeteredChannel(CompressingChannel):
+    """channel counting the messages passing through it"""
+
+    __slots__ = ()
+
+    def send(self, data):
+        # messages start with their type, see rpyc.core.protocol
+        if data[0] == consts.MSG_REQUEST:
+            self.statistics.requests += 1
+        else:
+            self.statistics.callbacks += 1
+        super().send(data)
+
+
+def negotiate_compression(conn, channel: CompressingChannel, codec: str,
+                          threshold: int, level: Optional[int] = None):
+    """
+    agree with the server on compressing frames above ``threshold`` bytes
+    with ``codec``, the RPyC default is kept if the server refuses
+    """
+    if codec not in CODECS:
+        raise ValueError(
+            f'unknown compression {codec!r}, use one of {", ".join(CODECS)}'
+        )
+    try:
+        negotiate = conn.root.negotiate_compression
+    except AttributeError:
+        # server of a version without negotiation
+        return False
+    if not negotiate(codec, threshold, level):
+        return False
+    channel.configure(codec, threshold, level)
+    return True
+
+
+def start_serving(conn):
+    """forward output of the remote and serve its callbacks from now on"""
+    # pylint: disable=W0212
+    conn._is_redirected = False
+    if conn._serving is not None:
+        try:
+            conn._serving.release()
+        except RuntimeError:
+            pass
+    # pylint: enable=W0212
+
+
+class ConsoleStream:
+    """
+    Forwards to the current ``sys.stdout`` or ``sys.stderr``, which Robot
+    Framework replaces while running a keyword, so it can be installed on
+    the remote once per connection
+    """
+    __slots__ = ('_name', )
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def write(self, data):
+        """write ``data`` to the current stream"""
+        return getattr(sys, self._name).write(data)
+
+    def flush(self):
+        """flush the current stream"""
+        getattr(sys, self._name).flush()
+
+    def __getattr__(self, name):
+        return getattr(getattr(sys, self._name), name)
+
+
+def install_redirect(conn):
+    """
+    install the output sinks on the remote once, so keyword calls only
+    have to switch them on instead of redirecting before each call
+    """
+    # pylint: disable=W0212
+    try:
+        install = conn.root.install_redirect
+    except AttributeError:
+        # server of a version without installed sinks
+        conn._redirect_installed = False
+        return
+    install(
+        ConsoleStream('stdout'),
+        ConsoleStream('stderr'),
+        robotapilogger.write,
+        robotapilogger.console,
+        conn._robotapilogreplay,
+    )
+    conn._redirect_installed = True
+    # pylint: enable=W0212
+
 
 @contextmanager
-def redirect(conn):
+def redirect(conn, switch=False):
     """
     Redirects the other party's ``stdout`` and ``stderr`` to local
-    """
 
+    With ``switch``, the caller asks the remote to switch on the sinks
+    installed by ``install_redirect`` with its request, which saves the
+    round trips to redirect and restore. The context then tells whether
+    the request has to do so.
+    """
     if current_thread().name not in LOGGING_THREADS:
-        yield
-    else:
-        alreadyredirected, conn._is_redirected = conn._is_redirected, True  # noqa, E501 pylint: disable=W0212
-        # pylint: disable=W0212
-        if not alreadyredirected and conn._is_connected:
-            if conn._bgthread is not None:
-                try:
-                    conn._bgthread.pause()
-                except RuntimeError:
-                    pass
+        yield False
+        return
+    # pylint: disable=W0212
+    alreadyredirected, conn._is_redirected = conn._is_redirected, True
+    if alreadyredirected or not conn._is_connected:
+        yield False
+        return
+    if conn._serving is not None:
+        try:
+            conn._serving.acquire()
+        except RuntimeError:
+            pass
+    try:
+        if switch and conn._redirect_installed:
+            yield True
+        else:
+            with redirect_sinks(conn):
+                yield False
+    finally:
+        conn._is_redirected = False
+        if conn._serving is not None:
+            try:
+                conn._serving.release()
+            except RuntimeError:
+                pass
+    # pylint: enable=W0212
 
-            # pylint: enable=W0212
-            orig_stdout = conn.root.stdout
-            orig_stderr = conn.root.stderr
-            orig_robotapilogwriter = conn.root.robotapilogwriter
-            orig_robotapilogconsole = conn.root.robotapilogconsole
 
-            try:
-                conn.root.stderr = sys.stderr
-                conn.root.stdout = sys.stdout
-                conn.root.robotapilogwriter = robotapilogger.write
-                conn.root.robotapilogconsole = robotapilogger.console
-                yield
-            finally:
-                try:
-                    conn.root.stdout = orig_stdout
-                    conn.root.stderr = orig_stderr
-                    conn.root.robotapilogwriter = orig_robotapilogwriter
-                    conn.root.robotapilogconsole = orig_robotapilogconsole
-                except EOFError:
-                    pass
-                # pylint: disable=W0212
-                conn._is_redirected = False
-                if conn._bgthread is not None:
-                    try:
-                        conn._bgthread.resume()
-                    except RuntimeError:
-                        pass
-                # pylint: enable=W0212
-        else:
-            yield
+@contextmanager
+def redirect_sinks(conn):
+    """install the current output sinks on the remote and restore them"""
+    # pylint: disable=W0212
+    start = time.perf_counter()
+    conn._redirect(
+        sys.stdout,
+        sys.stderr,
+        robotapilogger.write,
+        robotapilogger.console,
+        conn._robotapilogreplay,
+    )
+    redirect_time = time.perf_counter() - start
+    try:
+        yield
+    finally:
+        start = time.perf_counter()
+        try:
+            conn._restore()
+        except EOFError:
+            pass
+        redirect_time += time.perf_counter() - start
+        if conn._statistics is not None:
+            conn._statistics.redirect_time += redirect_time
+    # pylint: enable=W0212
 
 
 def redirect_output(func: Callable):
@@ -99,49 +358,307 @@ class Service(rpyc.Service):
     __slots__ = ()
 
     @property
-    def bgthread(self):
-        """Give access to BgServingThread in current connection"""
+    def serving(self):
+        """Give access to the dispatcher registration of current connection"""
         # pylint: disable=W0212,E1101
-        return Connection.current()._bgthread
+        return Connection.current()._serving
         # pylint: enable=W0212,E1101
 
+    @property
+    def bgthread(self):
+        """Deprecated alias of ``serving``, which replaced BgServingThread"""
+        warnings.warn(
+            'bgthread is deprecated, use serving instead',
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self.serving
+
     def on_connect(self, conn):
         """called when the connection is established"""
         super().on_connect(conn)
         self._install(conn, conn.root)
 
-        def ignore_eoferror_exception(exc):
-            if not isinstance(exc, EOFError):
-                raise exc from None
-
         # pylint: disable=W0212
         conn._is_connected = True
         conn._is_redirected = True
-        conn._bgthread = rpyc.BgServingThread(
-            conn,
-            callback=ignore_eoferror_exception,
-            active=False
-        )
+        conn._redirect_installed = False
+        conn._robotapilogreplay = None
+        conn._statistics = None
+        conn._shared_memory = SharedMemoryTransfer()
+        conn._serving = dispatcher.register(conn)
         # pylint: enable=W0212
 
     def on_disconnect(self, conn):
         # pylint: disable=W0212
-        bgthread, conn._bgthread = conn._bgthread, None
-        if bgthread is not None:
-            bgthread.stop()
+        serving, conn._serving = conn._serving, None
+        if serving is not None:
+            serving.stop()
         conn._is_connected = False
         conn._is_redirected = True
+        conn._shared_memory.release()
         # pylint: enable=W0212
         super().on_disconnect(conn)
 
     @staticmethod
     def _install(conn, slave):
         """install commands from remote on the client"""
+        # pylint: disable=W0212
         conn.eval = slave.eval
         conn.execute = slave.execute
+        conn._redirect = slave.redirect
+        conn._restore = slave.restore
+        conn.run_keyword = slave.run_keyword
+        conn.start_keyword_captured = slave.start_keyword_captured
+        conn.run_keywords = slave.run_keywords
+        # pylint: enable=W0212
+
+
+# pylint: disable=R0913
+def connection_factory(peer: str, port: int, *,
+                       ipv6: bool = False,
+                       socket_path: Optional[str] = None,
+                       timeout=None,
+                       logger=None,
+                       batch_logging: bool = False,
+                       compression: Optional[str] = None,
+                       compression_threshold: int = 1024,
+                       compression_level: Optional[int] = None,
+                       connection_pool: bool = False,
+                       **rpyc_config):
+    """
+    return a key identifying the connection settings and a function
+    connecting with them, through the connection pool if requested
+    """
+    if logger is None:
+        logger = logging.getLogger('RPyCRobotRemote.Client')
+
+    config = {}
+    if rpyc_config:
+        config.update(rpyc_config)
+
+    config.update(
+        {
+            'allow_all_attrs': True,
+            'allow_getattr': True,
+            'allow_setattr': True,
+            'allow_delattr': True,
+            'allow_exposed_attrs': False,
+            'logger': logger,
+        }
+    )
+
+    if timeout is not None:
+        config['sync_request_timeout'] = timestr_to_secs(
+            timeout,
+            round_to=None
+        )
+
+    def connect():
+        statistics = CallStatistics()
+        if socket_path is None:
+            stream = SocketStream.connect(
+                peer, port, ipv6=ipv6, keepalive=True
+            )
+        else:
+            stream = SocketStream.unix_connect(socket_path)
+        channel = MeteredChannel(stream, statistics)
+        try:
+            conn = connect_channel(
+                channel,
+                service=Service,
+                config=config,
+            )
+        except Exception:
+            stream.close()
+            raise
+
+        if compression is not None:
+            negotiate_compression(
+                conn, channel, compression, compression_threshold,
+                compression_level
+            )
+
+        # pylint: disable=W0212
+        conn._statistics = statistics
+        # collect robot.api.logger messages on remote and replay them
+        # here in one batch instead of forwarding each single message
+        if batch_logging:
+            conn._robotapilogreplay = replay_log_messages
+        install_redirect(conn)
 
+        # automatic redirect stdout + stderr from remote during
+        # during handling of sync_request
+        conn._is_redirected = LoggerApi is not None
+        # pylint: enable=W0212
+        if LoggerApi is None:
+            start_serving(conn)
+        conn.sync_request = redirect_output(conn.sync_request)
+        return conn
+
+    key = (peer, port, ipv6, socket_path, batch_logging, compression,
+           compression_threshold, compression_level,
+           repr(sorted(config.items())))
+    if connection_pool:
+        return (True, key), functools.partial(default_pool.acquire, key,
+                                              connect)
+    return (False, key), connect
+# pylint: enable=R0913
+
+
+def connect_in_background(connect: Callable) -> Future:
+    """call ``connect`` in a new thread, its result is given by the future"""
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(connect())
+        except BaseException as e:  # pylint: disable=W0718
+            future.set_exception(e)
+
+    Thread(target=run, name='RPyCRobotRemoteConnect', daemon=True).start()
+    return future
 
-class RPyCRobotRemoteClient:
+
+def take_background_connection(key) -> Optional[Future]:
+    """return the connection started in the background for ``key``"""
+    with _background_lock:
+        return _background_connections.pop(key, None)
+
+
+def start_suite_connections():
+    """
+    start connecting in the background for all libraries imported by the
+    current suite with ``background_connect``, so they connect at the same
+    time instead of one after the other during their import
+    """
+    global _background_suite  # pylint: disable=W0603
+    try:
+        builtin = BuiltIn()
+        source = builtin.get_variable_value('${SUITE SOURCE}')
+    except RobotNotRunningError:
+        return
+    if not source:
+        return
+    with _background_lock:
+        if source == _background_suite:
+            return
+        _background_suite = source
+    try:
+        imports = suite_library_imports(source)
+    except Exception:  # pylint: disable=W0718
+        # the libraries still connect in the background on their own
+        return
+    for name, args in imports:
+        try:
+            if builtin.replace_variables(name) not in LIBRARY_NAMES:
+                continue
+            settings = import_settings(
+                [builtin.replace_variables(arg) for arg in args]
+            )
+        except Exception:  # pylint: disable=W0718
+            # the import itself reports what is wrong
+            continue
+        if not settings.pop('background_connect'):
+            continue
+        key, connect = connection_factory(**settings)
+        with _background_lock:
+            if key not in _background_connections:
+                _background_connections[key] = connect_in_background(
+                    connect
+                )
+
+
+class LibraryImports(ModelVisitor):
+    """collects ``(name, args)`` of the library imports of a parsed file"""
+
+    def __init__(self):
+        self.imports = []
+
+    def visit_LibraryImport(self, node):  # pylint: disable=C0103
+        """called for each library import"""
+        self.imports.append((node.name, node.args))
+
+
+def suite_library_imports(source) -> list:
+    """
+    return ``(name, args)`` of the libraries imported by the suite file or
+    by the initialization file of the suite directory ``source``
+    """
+    path = pathlib.Path(source)
+    if path.is_dir():
+        path = next(
+            (init for init in sorted(path.glob('__init__.*'))
+             if init.suffix.lower() in SUITE_INIT_SUFFIXES),
+            None
+        )
+        if path is None:
+            return []
+    visitor = LibraryImports()
+    visitor.visit(get_model(path))
+    return visitor.imports
+
+
+def import_settings(args) -> dict:
+    """
+    return the connection settings given by the arguments of a library
+    import, converted like Robot Framework does for the common types
+    """
+    positional = []
+    named = {}
+    for arg in args:
+        if not isinstance(arg, str):
+            positional.append(arg)
+            continue
+        name, separator, value = arg.partition('=')
+        if separator and name.isidentifier():
+            named[name] = value
+        elif named:
+            raise ValueError('positional argument after named arguments')
+        else:
+            positional.append(arg)
+    signature = inspect.signature(RPyCRobotRemoteClient)
+    bound = signature.bind(*positional, **named)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    settings = arguments.pop('rpyc_config')
+    for name in itertools.chain(
+            inspect.signature(connection_factory).parameters,
+            ('background_connect', )):
+        if name in arguments:
+            settings[name] = convert_argument(
+                signature.parameters[name].annotation, arguments[name]
+            )
+    return settings
+
+
+def convert_argument(annotation, value):
+    """convert argument ``value`` given as text to ``annotation``"""
+    if not isinstance(value, str):
+        return value
+    if annotation is bool:
+        return is_truthy(value)
+    if annotation in (Optional[int], Optional[str]) and \
+            value.upper() == 'NONE':
+        return None
+    if annotation in (int, Optional[int]):
+        return int(value)
+    return value
+
+
+def close_background_connections():
+    """close connections started in the background which were not used"""
+    with _background_lock:
+        futures = list(_background_connections.values())
+        _background_connections.clear()
+    for future in futures:
+        try:
+            future.result().close()
+        except Exception:  # pylint: disable=W0718
+            pass
+
+
+class RPyCRobotRemoteClient:  # pylint: disable=R0902
     """
     Implements Remote Client Interface for Robot Framework based on RPyC
     """
@@ -150,13 +667,28 @@ class RPyCRobotRemoteClient:
 
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
 
-    # pylint: disable=R0913
+    # pylint: disable=R0913,R0914,R0915
     def __init__(self, /,  # noqa, C901
                  peer: str = 'localhost',
                  port: int = 18861, *,
                  ipv6: bool = False,
+                 socket_path: Optional[str] = None,
                  timeout=None,
                  logger=None,
+                 batch_logging: bool = False,
+                 serializer: Optional[Serializer] = None,
+                 arguments_by_value: bool = False,
+                 pickle_arguments: bool = False,
+                 shared_memory_threshold: Optional[int] = None,
+                 stream_chunk_size: Optional[int] = None,
+                 compression: Optional[str] = None,
+                 compression_threshold: int = 1024,
+                 compression_level: Optional[int] = None,
+                 connection_pool: bool = False,
+                 lazy_connect: bool = False,
+                 background_connect: bool = False,
+                 reconnect_timeout=None,
+                 statistics_report: Optional[str] = None,
                  **rpyc_config):
 
         instance = self
@@ -172,7 +704,11 @@ class RPyCRobotRemoteClient:
 
             def close(self):
                 """ called by Robot Framework when library will be removed """
-                instance._disconnect()  # pylint: disable=W0212
+                # pylint: disable=W0212
+                if statistics_report:
+                    instance._write_statistics_report(statistics_report)
+                instance._disconnect()
+                # pylint: enable=W0212
 
         self.ROBOT_LIBRARY_LISTENER = CloseListener()  # pylint: disable=C0103
 
@@ -195,63 +731,59 @@ class RPyCRobotRemoteClient:
 
                 def _set_redirect_and_unregister(self):
                     # pylint: disable=W0212
-                    if instance._client._is_connected:
-                        instance._client._is_redirected = False
-                        if instance._client._bgthread is not None:
-                            try:
-                                instance._client._bgthread.resume()
-                            except RuntimeError:
-                                pass
+                    instance._imported = True
+                    if instance._connected():
+                        start_serving(instance._client)
                     # pylint: enable=W0212
                     LOGGER.unregister_logger(self)
 
             LOGGER.register_logger(Logger())
+        self._imported = LoggerApi is None
         self._keywords_cache = None
-        if logger is None:
-            logger = logging.getLogger('RPyCRobotRemote.Client')
-
-        config = {}
-        if rpyc_config:
-            config.update(rpyc_config)
-
-        config.update(
-            {
-                'allow_all_attrs': True,
-                'allow_getattr': True,
-                'allow_setattr': True,
-                'allow_delattr': True,
-                'allow_exposed_attrs': False,
-                'logger': logger,
-            }
+        self._keywords_specifications = None
+        self._keywords_by_normalized_name = None
+        self._fingerprint = None
+        self._reconnect_timeout = (
+            None if reconnect_timeout is None
+            else timestr_to_secs(reconnect_timeout, round_to=None)
         )
-
-        if timeout is not None:
-            config['sync_request_timeout'] = convert_time(
-                timeout,
-                result_format='number'
-            )
-
-        self._client = rpyc.connect(
-            peer,
-            port,
-            service=Service,
-            config=config,
-            ipv6=ipv6,
-            keepalive=True,
+        self._last_used = time.monotonic()
+        self._attributes_cache = {}
+        self._serializer = (
+            default_serializer if serializer is None else serializer
+        )
+        self._serializable_types = None
+        self._accepts_pickle = None
+        self._arguments_by_value = arguments_by_value
+        self._pickle_arguments = pickle_arguments
+        self._shared_memory_threshold = shared_memory_threshold
+        self._stream_chunk_size = stream_chunk_size
+        self._started_keywords = {}
+        self._started_keywords_ids = itertools.count(1)
+        self._call_statistics = {}
+        self._pool = default_pool if connection_pool else None
+        self._connection_lock = Lock()
+        self._pending_connection = None
+        key, self._connect = connection_factory(
+            peer, port, ipv6=ipv6, socket_path=socket_path, timeout=timeout,
+            logger=logger, batch_logging=batch_logging,
+            compression=compression,
+            compression_threshold=compression_threshold,
+            compression_level=compression_level,
+            connection_pool=connection_pool, **rpyc_config
         )
+        if background_connect:
+            start_suite_connections()
+            self._pending_connection = (
+                take_background_connection(key) or
+                connect_in_background(self._connect)
+            )
+        elif lazy_connect:
+            self._pending_connection = self._connect
+        else:
+            self._client = self._connect()
         self.__connected_instances.append(self)
-
-        # automatic redirect stdout + stderr from remote during
-        # during handling of sync_request
-        self._client._is_redirected = LoggerApi is not None
-        if (self._client._is_redirected is False and
-                self._client._bgthread is not None):
-            try:
-                self._client._bgthread.resume()
-            except RuntimeError:
-                pass
-        self._client.sync_request = redirect_output(self._client.sync_request)
-    # pylint: enable=R0913
+    # pylint: enable=R0913,R0914,R0915
 
     @classmethod
     @not_keyword
@@ -269,20 +801,74 @@ class RPyCRobotRemoteClient:
         return getattr(self._client.root.library, '__doc__')
 
     def __getattr__(self, name: str):
+        if (name == '_client' and
+                self.__dict__.get('_pending_connection') is not None):
+            return self._establish_connection()
         if (name[0:1] != '_' and
                 (not name.startswith('ROBOT_LIBRARY_') or
-                 self._client._is_connected)):
+                 self._connected())):
             try:
-                obj = getattr(self._client.root.library, name)
-            except AttributeError:
-                pass
-            else:
-                if name.startswith('ROBOT_LIBRARY_') or callable(obj):
-                    return obj
+                obj = self._attributes_cache[name]
+            except KeyError:
+                obj = self._attributes_cache[name] = self._resolve(name)
+            if obj is not UNDEFINED:
+                return obj
         raise AttributeError(
             f'{type(self).__name__!r} object has no attribute {name!r}'
         )
 
+    @not_keyword
+    def _connected(self, /) -> bool:
+        """tell if connected, without connecting if it is deferred"""
+        pending = self._pending_connection
+        if pending is not None and not isinstance(pending, Future):
+            return False
+        client = self.__dict__.get('_client')
+        if client is None and pending is None:
+            return False
+        return self._client._is_connected  # pylint: disable=W0212
+
+    @not_keyword
+    def _establish_connection(self, /):
+        """connect now if connecting was deferred or done in background"""
+        with self._connection_lock:
+            conn = self.__dict__.get('_client')
+            if conn is not None:
+                return conn
+            pending = self._pending_connection
+            try:
+                if isinstance(pending, Future):
+                    conn = pending.result()
+                else:
+                    conn = pending()
+            except Exception:
+                # try again on the next use
+                self._pending_connection = self._connect
+                raise
+            self._client = conn
+            self._pending_connection = None
+        if self._imported:
+            start_serving(conn)
+        return conn
+
+    @not_keyword
+    def _resolve(self, /, name: str):
+        """resolve a keyword or ``ROBOT_LIBRARY_*`` setting on remote"""
+        try:
+            obj = getattr(self._client.root.library, name)
+        except AttributeError:
+            return UNDEFINED
+        if name.startswith('ROBOT_LIBRARY_') or callable(obj):
+            return obj
+        return UNDEFINED
+
+    def invalidate_remote_cache(self, /):
+        """Forget remote attributes resolved so far.
+
+        They are fetched again from the remote server on next access.
+        """
+        self._attributes_cache.clear()
+
     def remote_eval(self, /, text):
         """evaluate arbitrary code (using ``eval``) on remote"""
         return self._client.eval(text)
@@ -293,7 +879,7 @@ class RPyCRobotRemoteClient:
 
     def stop_remote_server(self, /):
         """Stop remote server."""
-        self._stop_bg_thread()
+        self._stop_serving()
         try:
             self._client.root.stop_remote_server()
         except EOFError:
@@ -301,46 +887,527 @@ class RPyCRobotRemoteClient:
         self._disconnect()
 
     @not_keyword
-    def _stop_bg_thread(self, /):
+    def _stop_serving(self, /):
         # pylint: disable=W0212
-        bgthread, self._client._bgthread = self._client._bgthread, None
+        serving, self._client._serving = self._client._serving, None
         # pylint: enable=W0212
-        if bgthread is not None:
-            bgthread.stop()
+        if serving is not None:
+            serving.stop()
+
+    @not_keyword
+    def _check_connection(self, /):
+        """
+        reconnect if the connection was lost. Connections unused for a
+        while are pinged first, as a lost one is only noticed on its use.
+        """
+        conn = self._client
+        now = time.monotonic()
+        idle = now - self._last_used
+        self._last_used = now
+        if not conn.closed:
+            if idle < PING_IDLE_TIME:
+                return
+            try:
+                conn.ping(timeout=PING_TIMEOUT)
+                return
+            except (EOFError, OSError):
+                pass
+        self._reconnect()
+
+    @not_keyword
+    def _reconnect(self, /):
+        """
+        connect again, retrying with exponential backoff until
+        ``reconnect_timeout`` expires
+        """
+        deadline = time.monotonic() + self._reconnect_timeout
+        delay = RECONNECT_DELAY
+        try:
+            self._client.close()
+        except EOFError:
+            pass
+        if self._pool is not None:
+            self._pool.release(self._client)
+        while True:
+            try:
+                conn = self._connect()
+                break
+            except (EOFError, OSError) as e:
+                if time.monotonic() + delay > deadline:
+                    raise ConnectionError(
+                        f'reconnecting to remote server failed: {e}'
+                    ) from e
+                time.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        self._client = conn
+        if self._imported:
+            start_serving(conn)
+        self.invalidate_remote_cache()
+        self._serializable_types = None
+        self._accepts_pickle = None
+        if (self._fingerprint is not None and
+                self._fingerprint != conn.root.get_library_fingerprint()):
+            # the server runs a different library, discover it again
+            self._fingerprint = None
+            self._keywords_cache = None
+            self._keywords_specifications = None
+            self._keywords_by_normalized_name = None
 
     @not_keyword
     def _disconnect(self, /):
         try:
             self.__connected_instances.remove(self)
         except ValueError:
-            pass
+            # disconnected already, e.g. closed by Robot Framework before
+            # being garbage collected, or the constructor failed. A pooled
+            # connection may be used by other instances by now.
+            return
+        pending = self.__dict__.get('_pending_connection')
+        if pending is not None:
+            self._pending_connection = None
+            if isinstance(pending, Future):
+                # connecting in background, close it when it is done
+                pending.add_done_callback(self._close_pending_connection)
+            return
+        client = self.__dict__.get('_client')
+        if client is None:
+            # deferred connection which was never established
+            return
+        if self._pool is not None:
+            self._pool.release(client)
+            return
         # pylint: disable=W0212
-        if self._client._is_connected:
-            self._client._is_connected = False
+        if client._is_connected:
+            client._is_connected = False
             # pylint: enable=W0212
-            self._stop_bg_thread()
-            self._client.close()
+            self._stop_serving()
+            client.close()
+
+    @not_keyword
+    def _close_pending_connection(self, /, future: Future):
+        if future.exception() is not None:
+            return
+        if self._pool is not None:
+            self._pool.release(future.result())
+        else:
+            future.result().close()
 
     @not_keyword
     def get_keyword_names(self, /):
         """Return keyword names supported by the remote server."""
         if self._keywords_cache is None:
             with redirect(self._client):
-                base = set(self._client.root.get_keyword_names())
-                attributes = [(name, getattr(self, name))
-                              for name in dir(self) if name[0:1] != '_']
-                self._keywords_cache = tuple(
-                    sorted(
-                        base | {
-                            name for name, value in attributes
-                            if (callable(value) and
-                                not getattr(value, 'robot_not_keyword', False))
-                        }
-                    )
+                specifications = {
+                    spec[0]: spec + (False, )
+                    for spec in self._client.root.get_keyword_specifications()
+                }
+            attributes = [(name, getattr(self, name))
+                          for name in dir(self) if name[0:1] != '_']
+            specifications.update(
+                (name, keyword_specification(name, value) + (True, ))
+                for name, value in attributes
+                if (callable(value) and
+                    not getattr(value, 'robot_not_keyword', False))
+            )
+            self._keywords_specifications = specifications
+            self._keywords_by_normalized_name = {
+                normalize(keyword, ignore=('_', )): specification
+                for keyword, specification in specifications.items()
+            }
+            self._keywords_cache = tuple(sorted(specifications))
+            if self._reconnect_timeout is not None:
+                self._fingerprint = (
+                    self._client.root.get_library_fingerprint()
                 )
         return self._keywords_cache
 
+    @not_keyword
+    def run_keyword(self, /, name, args, kwargs=None):
+        """Run keyword ``name`` either locally or on the remote server."""
+        if self._reconnect_timeout is not None:
+            self._check_connection()
+        statistics = self._client._statistics  # pylint: disable=W0212
+        before = statistics.snapshot()
+        start = time.perf_counter()
+        try:
+            specification = self._keyword_specification(name)
+            if specification[6]:
+                return getattr(self, name)(*args, **(kwargs or {}))
+            request = self._keyword_request(specification, args, kwargs)
+            with redirect(self._client, switch=True) as switch:
+                outcome = self._client.run_keyword(
+                    *request, *((True, ) if switch else ())
+                )
+            return self._decode_result(*outcome)
+        finally:
+            self._record_call(
+                name,
+                time.perf_counter() - start,
+                before,
+                statistics.snapshot(),
+            )
+
+    def get_remote_call_statistics(self, /):
+        """Return statistics of the keywords called so far.
+
+        For each keyword the number of calls, their total and maximum
+        time, the number of RPyC requests sent, callbacks served for the
+        remote, message bytes sent and received before and after
+        compression (``wire_bytes_*``) and the time spent setting up and
+        ending output redirection are given.
+        """
+        return {name: dict(values)
+                for name, values in self._call_statistics.items()}
+
+    def get_remote_server_statistics(self, /):
+        """Return statistics collected by the remote server.
+
+        They contain the number of active and total connections, live
+        netrefs, which are ``None`` if the RPyC version of the server does
+        not expose them, threads of the whole server process, bytes and
+        compression ratio of connections which negotiated compression,
+        statistics of the server class like workers and queued connections,
+        and for each keyword the number of calls and failures with total,
+        maximum and percentiles of its duration.
+        """
+        return json.loads(self._client.root.get_server_statistics())
+
+    @not_keyword
+    def _record_call(self, /, name, duration, before, after):
+        values = self._call_statistics.get(name)
+        if values is None:
+            values = self._call_statistics[name] = {
+                'calls': 0,
+                'time': 0.0,
+                'max_time': 0.0,
+                **{counter: 0 for counter in CallStatistics.__slots__},
+            }
+        values['calls'] += 1
+        values['time'] += duration
+        values['max_time'] = max(values['max_time'], duration)
+        for counter, first, last in zip(CallStatistics.__slots__,
+                                        before, after):
+            values[counter] += last - first
+
+    @not_keyword
+    def _write_statistics_report(self, /, path):
+        with open(path, 'w', encoding='utf-8') as report:
+            json.dump(self.get_remote_call_statistics(), report, indent=2)
+
+    def run_remote_keywords(self, /, *calls, stop_on_failure: bool = True):
+        """Run several remote keywords one after the other in one request.
+
+        Each call is a list with the keyword name followed by its
+        arguments, a dictionary as last item gives the named arguments.
+        Keywords without arguments can be given by name only.
+
+        Returns the results of all keywords. With ``stop_on_failure`` the
+        first failure ends the execution and fails this keyword. Otherwise
+        all keywords are run and a ``(status, value)`` pair is returned for
+        each of them like `Run Keyword And Ignore Error` does, with status
+        ``PASS`` and the result or ``FAIL`` and the error message.
+        """
+        request = (
+            tuple(self._keyword_call_request(call) for call in calls),
+            stop_on_failure,
+            self._serializer.names(),
+            self._shared_memory(),
+            self._stream_chunk_size,
+        )
+        with redirect(self._client, switch=True) as switch:
+            outcomes = self._client.run_keywords(
+                *request, *((True, ) if switch else ())
+            )
+        results = []
+        for index, (passed, outcome) in enumerate(outcomes, 1):
+            if passed:
+                result = self._decode_result(*outcome)
+                results.append(result if stop_on_failure else ('PASS', result))
+            elif stop_on_failure:
+                raise RuntimeError(f'Keyword {index} ({calls[index - 1]}) '
+                                   f'failed: {outcome}')
+            else:
+                results.append(('FAIL', outcome))
+        return results
+
+    def start_remote_keyword(self, /, name, *args, **kwargs):
+        """Start remote keyword ``name`` without waiting for it to finish.
+
+        Returns a handle to pass to `Wait For Remote Keyword`. Output and
+        log messages of the keyword are forwarded when waiting for it.
+        """
+        specification = self._find_keyword_specification(name)
+        if specification[6]:
+            raise ValueError(f'{name!r} is not a remote keyword')
+        started = StartedKeyword(specification[0])
+        self._client.start_keyword_captured(
+            started.done, *self._keyword_request(specification, args, kwargs)
+        )
+        handle = next(self._started_keywords_ids)
+        self._started_keywords[handle] = started
+        return handle
+
+    def wait_for_remote_keyword(self, /, handle, timeout=None):
+        """Wait for a keyword started by `Start Remote Keyword`.
+
+        Returns the result of the keyword or fails like it. If ``timeout``
+        expires first, the keyword can be waited for again.
+        """
+        handle = int(handle)
+        try:
+            started = self._started_keywords[handle]
+        except KeyError:
+            raise ValueError(
+                f'no remote keyword started with handle {handle}'
+            ) from None
+        if timeout is not None:
+            timeout = timestr_to_secs(timeout, round_to=None)
+        deadline = Timeout(timeout)
+        while not started.finished.is_set() and not deadline.expired():
+            # the remote calls back once the keyword finished
+            self._client.serve(deadline, predicate=started.finished.is_set)
+        if not started.finished.is_set():
+            raise TimeoutError(
+                f'remote keyword {started.name!r} did not finish within '
+                f'{secs_to_timestr(timeout)}'
+            )
+        del self._started_keywords[handle]
+        passed, outcome, output = started.outcome
+        replay_log_messages(output)
+        if not passed:
+            # pylint: disable=W0212
+            config = self._client._config
+            # pylint: enable=W0212
+            raise vinegar.load(
+                outcome,
+                import_custom_exceptions=config['import_custom_exceptions'],
+                instantiate_custom_exceptions=config[
+                    'instantiate_custom_exceptions'
+                ],
+                instantiate_oldstyle_exceptions=config[
+                    'instantiate_oldstyle_exceptions'
+                ],
+            )
+        by_value, result = outcome
+        return self._decode_result(by_value, result)
+
+    def wait_for_all_remote_keywords(self, /, timeout=None):
+        """Wait for all keywords started by `Start Remote Keyword`.
+
+        Returns their results in the order they were started. If some
+        of them fail, the first failure is reported after all finished.
+        """
+        results = []
+        error = None
+        for handle in sorted(self._started_keywords):
+            try:
+                results.append(self.wait_for_remote_keyword(handle, timeout))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                if handle in self._started_keywords:
+                    # timeout expired while the keyword is still running
+                    raise
+                results.append(None)
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+        return results
+
+    @not_keyword
+    def _keyword_request(self, /, specification, args, kwargs):
+        """return the arguments of the remote ``run_keyword`` methods"""
+        args = tuple(args)
+        kwargs = tuple((kwargs or {}).items())
+        encoded = ()
+        by_value = (self._arguments_by_value or
+                    ARGUMENTS_BY_VALUE_TAG in specification[4])
+        shared_memory = self._shared_memory()
+        if by_value or shared_memory is not None:
+            args, kwargs, encoded = self._encode_arguments(
+                args, kwargs, by_value, shared_memory
+            )
+        return (
+            specification[0],
+            args,
+            kwargs,
+            self._serializer.names(),
+            encoded,
+            shared_memory,
+            self._stream_chunk_size,
+        )
+
+    @not_keyword
+    def _keyword_call_request(self, /, call):
+        """return ``(name, args, kwargs, encoded)`` of a batched call"""
+        name, *args = (call, ) if isinstance(call, str) else call
+        kwargs = args.pop() if args and isinstance(args[-1], dict) else {}
+        specification = self._find_keyword_specification(name)
+        if specification[6]:
+            raise ValueError(f'{name!r} is not a remote keyword')
+        name, args, kwargs, _, encoded, _, _ = self._keyword_request(
+            specification, args, kwargs
+        )
+        return name, args, kwargs, encoded
+
+    @not_keyword
+    def _decode_result(self, /, by_value, result):
+        if by_value == SHARED_MEMORY:
+            return receive_shared_memory(result)
+        if by_value == STREAM:
+            return self._iterate_stream(result)
+        if by_value:
+            return self._serializer.loads(result)
+        return result
+
+    @not_keyword
+    def _iterate_stream(self, /, stream):
+        """iterate over the items handed out by a remote ``ResultStream``"""
+        done = False
+        try:
+            while not done:
+                by_value, items, done = stream.next_chunk()
+                yield from self._decode_result(by_value, items)
+        finally:
+            if not done:
+                try:
+                    stream.close()
+                except EOFError:
+                    pass
+
+    @not_keyword
+    def _shared_memory(self, /):
+        """
+        return the threshold for transferring binary data through shared
+        memory or ``None`` if the server cannot access it
+        """
+        if self._shared_memory_threshold is None:
+            return None
+        transfer = self._client._shared_memory  # pylint: disable=W0212
+        if transfer.available is None:
+            token = b'RPyCRobotRemote'
+            descriptor = transfer.share(token)
+            transfer.available = (
+                self._client.root.probe_shared_memory(descriptor) == token
+            )
+        if not transfer.available:
+            return None
+        return self._shared_memory_threshold
+
+    @not_keyword
+    def _encode_arguments(self, /, args, kwargs, by_value, shared_memory):
+        """
+        encode arguments which can be passed by value or through shared
+        memory and return them together with a description of the encoded
+        ones
+        """
+        if by_value and self._serializable_types is None:
+            self._serializable_types = frozenset(
+                self._client.root.get_serializable_types()
+            )
+        if (by_value and self._pickle_arguments and
+                self._accepts_pickle is None):
+            # servers without allow_pickle get netrefs instead
+            self._accepts_pickle = self._client.root.accepts_pickle()
+        encoded = []
+
+        def encode(key, value):
+            if (shared_memory is not None and
+                    shareable(value, shared_memory)):
+                encoded.append((key, SHARED_MEMORY))
+                # pylint: disable=W0212
+                return self._client._shared_memory.share(value)
+                # pylint: enable=W0212
+            if not by_value or brine.dumpable(value):
+                return value
+            try:
+                value = self._serializer.dumps(
+                    value, self._serializable_types
+                )
+            except NotSerializable:
+                if not (self._pickle_arguments and self._accepts_pickle):
+                    return value
+                try:
+                    value = pickle.dumps(value)
+                except (pickle.PicklingError, TypeError, AttributeError):
+                    return value
+                encoded.append((key, 'pickle'))
+            else:
+                encoded.append((key, 'serializer'))
+            return value
+
+        args = tuple(encode(index, value) for index, value in enumerate(args))
+        kwargs = tuple((key, encode(key, value)) for key, value in kwargs)
+        return args, kwargs, tuple(encoded)
+
+    @not_keyword
+    def get_keyword_arguments(self, /, name):
+        """Return the arguments of keyword ``name``."""
+        arguments = self._keyword_specification(name)[1]
+        return None if arguments is None else list(arguments)
+
+    @not_keyword
+    def get_keyword_types(self, /, name):
+        """
+        Return the argument types of keyword ``name``, ``None`` if argument
+        conversion is disabled. Arguments of types unknown to Robot
+        Framework are not converted.
+        """
+        types = self._keyword_specification(name)[2]
+        if types is None:
+            return None
+        if types and not isinstance(types[0], tuple):
+            # types given by position
+            return [
+                type_ if type_ is None or convertible_type_name(type_)
+                else 'Any'
+                for type_ in types
+            ]
+        return {
+            argument: type_ for argument, type_ in types
+            if convertible_type_name(type_)
+        }
+
+    @not_keyword
+    def get_keyword_documentation(self, /, name):
+        """Return the documentation of keyword ``name``."""
+        if name == '__intro__':
+            return self.__doc__ or ''
+        return self._keyword_specification(name)[3]
+
+    @not_keyword
+    def get_keyword_tags(self, /, name):
+        """Return the tags of keyword ``name``."""
+        return list(self._keyword_specification(name)[4])
+
+    @not_keyword
+    def get_keyword_source(self, /, name):
+        """Return the source of keyword ``name``."""
+        return self._keyword_specification(name)[5]
+
+    @not_keyword
+    def _keyword_specification(self, /, name):
+        if self._keywords_specifications is None:
+            self.get_keyword_names()
+        try:
+            return self._keywords_specifications[name]
+        except KeyError:
+            return (name, None, (), '', (), None, False)
+
+    @not_keyword
+    def _find_keyword_specification(self, /, name):
+        """return the specification of keyword ``name`` as used in Robot"""
+        if self._keywords_by_normalized_name is None:
+            self.get_keyword_names()
+        try:
+            return self._keywords_by_normalized_name[
+                normalize(name, ignore=('_', ))
+            ]
+        except KeyError:
+            raise ValueError(f'no keyword {name!r} found') from None
+
 
 # pylint: disable=W0212
+register_atexit(close_background_connections)
+register_atexit(default_pool.close)
 register_atexit(RPyCRobotRemoteClient._disconnect_instances)
 # pylint: enable=W0212
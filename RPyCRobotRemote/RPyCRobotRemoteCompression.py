@@ -0,0 +1,109 @@
+"""
+Compression of the frames exchanged between client and server
+
+RPyC compresses every frame above 1 KiB with zlib. A client can negotiate
+a different codec, threshold and level with the server instead, e.g.
+``lzma`` for slow links or ``none`` for connections on the same host.
+The codec of a frame is given by its header, so frames remain readable
+by parties which only know the default ``zlib`` as long as it is used.
+"""
+import lzma
+import zlib
+from rpyc.core.channel import Channel
+
+# codec name: (header flag, compress, decompress)
+CODECS = {
+    'none': (0, None, None),
+    'zlib': (1, zlib.compress, zlib.decompress),
+    'lzma': (2,
+             lambda data, level: lzma.compress(data, preset=level),
+             lzma.decompress),
+}
+
+DECOMPRESSORS = {flag: decompress for flag, _, decompress in CODECS.values()}
+
+DEFAULT_LEVELS = {
+    'none': None,
+    'zlib': zlib.Z_DEFAULT_COMPRESSION,
+    'lzma': lzma.PRESET_DEFAULT,
+}
+
+
+class CompressionStatistics:  # pylint: disable=R0903
+    """counters of payload bytes and bytes passed to the stream"""
+
+    __slots__ = ('bytes_sent', 'bytes_received',
+                 'wire_bytes_sent', 'wire_bytes_received')
+
+    def __init__(self):
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.wire_bytes_sent = 0
+        self.wire_bytes_received = 0
+
+    def add(self, other):
+        """add the counters of ``other``"""
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+class CompressingChannel(Channel):
+    """
+    Channel compressing frames above ``threshold`` bytes with ``codec``
+
+    It reads frames of all codecs. ``statistics`` is any object with the
+    attributes of ``CompressionStatistics``.
+    """
+
+    __slots__ = ('statistics', '_flag', '_compress', '_threshold', '_level')
+
+    def __init__(self, stream, statistics, codec: str = 'zlib',
+                 threshold: int = Channel.COMPRESSION_THRESHOLD,
+                 level=None):
+        super().__init__(stream)
+        self.statistics = statistics
+        self.configure(codec, threshold, level)
+
+    def configure(self, codec: str, threshold: int, level=None):
+        """use ``codec`` for frames sent from now on"""
+        self._flag, self._compress, _ = CODECS[codec]
+        self._threshold = threshold
+        self._level = DEFAULT_LEVELS[codec] if level is None else level
+
+    def recv(self):
+        header = self.stream.read(self.FRAME_HEADER.size)
+        length, flag = self.FRAME_HEADER.unpack(header)
+        data = self.stream.read(length + len(self.FLUSHER))
+        data = data[:-len(self.FLUSHER)]
+        self.statistics.wire_bytes_received += len(data)
+        decompress = DECOMPRESSORS[flag]
+        if decompress is not None:
+            data = decompress(data)
+        self.statistics.bytes_received += len(data)
+        return data
+
+    def send(self, data):
+        self.statistics.bytes_sent += len(data)
+        flag = 0
+        if self._compress is not None and len(data) > self._threshold:
+            compressed = self._compress(data, self._level)
+            # incompressible data is sent as it is
+            if len(compressed) < len(data):
+                flag = self._flag
+                data = compressed
+        self.statistics.wire_bytes_sent += len(data)
+        self.stream.write(
+            self.FRAME_HEADER.pack(len(data), flag) + data + self.FLUSHER
+        )
+
+
+def compression_ratio(statistics) -> dict:
+    """return the ratio of payload to wire bytes in both directions"""
+    def ratio(payload, wire):
+        return payload / wire if wire else None
+
+    return {
+        'sent': ratio(statistics.bytes_sent, statistics.wire_bytes_sent),
+        'received': ratio(statistics.bytes_received,
+                          statistics.wire_bytes_received),
+    }
@@ -0,0 +1,227 @@
+"""
+Event driven serving of the client connections
+
+A single thread waits with a selector on the sockets of all client
+connections and serves a connection only when data arrived on it, e.g. a
+callback of the server outside of a keyword call. While a thread owns a
+connection, because it waits for the reply of its own request and has to
+serve the callbacks of the server itself, the dispatcher leaves the
+connection alone. Taking and giving back the ownership is a plain lock
+operation and needs no handshake with the dispatcher thread.
+"""
+import selectors
+import socket
+import threading
+from collections import deque
+
+# delay before a connection read by another thread is served again
+RETRY_INTERVAL = 0.005
+
+
+class Serving:
+    """
+    Registration of a connection with the dispatcher
+
+    The connection is owned, i.e. not served by the dispatcher, until
+    ``release`` is called for the first time. ``acquire`` and ``release``
+    raise ``RuntimeError`` once the registration was stopped.
+    """
+    __slots__ = ('conn', 'fileno', 'stopped', '_dispatcher', '_lock',
+                 '_owned', '_parked')
+
+    def __init__(self, parent, conn):
+        self.conn = conn
+        self.fileno = conn.fileno()
+        self.stopped = False
+        self._dispatcher = parent
+        self._lock = threading.Lock()
+        self._lock.acquire()  # pylint: disable=R1732
+        self._owned = True
+        self._parked = True
+
+    def acquire(self):
+        """take over serving the connection from the dispatcher"""
+        if self.stopped:
+            raise RuntimeError('connection is no longer served')
+        # waits only if the dispatcher is serving a message right now
+        self._lock.acquire()  # pylint: disable=R1732
+        self._owned = True
+
+    def release(self):
+        """hand serving the connection back to the dispatcher"""
+        if self.stopped:
+            raise RuntimeError('connection is no longer served')
+        if not self._owned:
+            raise RuntimeError('connection is not owned')
+        self._owned = False
+        self._lock.release()
+        if self._parked:
+            self._dispatcher.arm(self)
+
+    # names of the former BgServingThread methods
+    pause = acquire
+    resume = release
+
+    def stop(self):
+        """stop serving the connection, it cannot be served again"""
+        if not self.stopped:
+            self.stopped = True
+            self._dispatcher.disarm(self)
+
+    def serve(self) -> bool:
+        """
+        serve a message if nobody owns the connection, returns False if it
+        has to be retried later
+        """
+        if not self._lock.acquire(blocking=False):  # pylint: disable=R1732
+            self._parked = True
+            # the owner may have released before it could see the flag
+            if not self._lock.acquire(blocking=False):  # noqa: E501 pylint: disable=R1732
+                return True
+            self._parked = False
+        try:
+            if self.stopped:
+                return True
+            return self.conn.serve(0, wait_for_lock=False)
+        finally:
+            self._lock.release()
+
+
+class Dispatcher:
+    """
+    One thread serving all registered connections
+
+    The thread is started with the first registration and keeps waiting
+    for data, without consuming CPU time while all connections are idle.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._commands = deque()
+        self._selector = None
+        self._wakeup = None
+        self._thread = None
+
+    def register(self, conn) -> Serving:
+        """register ``conn``, it is owned until released the first time"""
+        serving = Serving(self, conn)
+        self._start()
+        return serving
+
+    def arm(self, serving: Serving):
+        """serve ``serving`` as soon as data arrives"""
+        self._command(self._arm, serving)
+
+    def disarm(self, serving: Serving):
+        """do not wait for data of ``serving`` anymore"""
+        self._command(self._disarm, serving)
+
+    def _command(self, command, serving):
+        if threading.current_thread() is self._thread:
+            command(serving)
+            return
+        with self._lock:
+            self._commands.append((command, serving))
+            wakeup = self._wakeup
+        if wakeup is not None:
+            try:
+                wakeup.send(b'\0')
+            except (BlockingIOError, InterruptedError):
+                # wakeup is pending already
+                pass
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._selector = selectors.DefaultSelector()
+            receive, self._wakeup = socket.socketpair()
+            receive.setblocking(False)
+            self._wakeup.setblocking(False)
+            self._selector.register(receive, selectors.EVENT_READ)
+            self._thread = threading.Thread(
+                target=self._run, args=(receive, ),
+                name='RPyCRobotRemoteDispatcher', daemon=True
+            )
+            self._thread.start()
+
+    def _arm(self, serving):
+        # pylint: disable=W0212
+        if serving.stopped or not serving._parked:
+            return
+        serving._parked = False
+        # pylint: enable=W0212
+        try:
+            self._selector.register(
+                serving.fileno, selectors.EVENT_READ, serving
+            )
+        except (KeyError, ValueError, OSError):
+            serving.stopped = True
+
+    def _disarm(self, serving):
+        serving._parked = True  # pylint: disable=W0212
+        key = self._selector.get_map().get(serving.fileno)
+        if key is not None and key.data is serving:
+            try:
+                self._selector.unregister(serving.fileno)
+            except (KeyError, ValueError, OSError):
+                pass
+
+    def _run(self, receive):
+        retries = []
+        while True:
+            try:
+                events = self._selector.select(
+                    RETRY_INTERVAL if retries else None
+                )
+            except (OSError, ValueError):
+                # a socket was closed before it was unregistered
+                self._remove_closed()
+                events = []
+            for serving in retries:
+                self._arm(serving)
+            retries = []
+            for key, _ in events:
+                if key.data is None:
+                    self._execute(receive)
+                elif not self._serve(key.data):
+                    # another thread is reading, its message is not ours
+                    self._disarm(key.data)
+                    retries.append(key.data)
+
+    def _execute(self, receive):
+        try:
+            while receive.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        with self._lock:
+            commands, self._commands = self._commands, deque()
+        for command, serving in commands:
+            command(serving)
+
+    def _serve(self, serving):
+        conn = serving.conn
+        try:
+            served = serving.serve()
+        except EOFError:
+            served = True
+        except Exception:  # pylint: disable=W0703
+            conn._config['logger'].exception(  # pylint: disable=W0212
+                'serving of connection failed'
+            )
+            serving.stop()
+            served = True
+        # pylint: disable=W0212
+        if serving.stopped or serving._parked or conn.closed:
+            self._disarm(serving)
+        # pylint: enable=W0212
+        return served
+
+    def _remove_closed(self):
+        for key in list(self._selector.get_map().values()):
+            if key.data is not None and key.data.conn.closed:
+                self._disarm(key.data)
+
+
+dispatcher = Dispatcher()
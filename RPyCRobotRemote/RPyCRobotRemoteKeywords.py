@@ -0,0 +1,140 @@
+"""
+Keyword specifications shared by the RPyCRobotRemote client and server
+
+Specifications are made of tuples and strings only, so that they can be
+transferred by value over a RPyC connection.
+"""
+import inspect
+from robot.errors import DataError
+from robot.utils import type_repr
+try:
+    from robot.api import TypeInfo
+except ImportError:
+    TypeInfo = None
+
+
+def argument_specification(function):
+    """return the arguments of ``function`` in the dynamic library format"""
+    try:
+        signature = inspect.signature(function)
+    except (TypeError, ValueError):
+        return None
+
+    spec = []
+    positional_only = False
+    keyword_only = False
+    for parameter in signature.parameters.values():
+        if parameter.kind is parameter.POSITIONAL_ONLY:
+            positional_only = True
+        elif positional_only:
+            spec.append('/')
+            positional_only = False
+
+        if parameter.kind is parameter.VAR_POSITIONAL:
+            spec.append(f'*{parameter.name}')
+            keyword_only = True
+        elif parameter.kind is parameter.VAR_KEYWORD:
+            spec.append(f'**{parameter.name}')
+        else:
+            if parameter.kind is parameter.KEYWORD_ONLY and not keyword_only:
+                spec.append('*')
+                keyword_only = True
+            if parameter.default is parameter.empty:
+                spec.append(parameter.name)
+            else:
+                spec.append((parameter.name, parameter.default))
+
+    if positional_only:
+        spec.append('/')
+    return tuple(spec)
+
+
+def type_name(hint):
+    """return the type ``hint`` as a name Robot Framework can convert"""
+    if hint is None or isinstance(hint, str):
+        return hint
+    if isinstance(hint, tuple):
+        # Robot Framework accepts a tuple of types as union
+        return ' | '.join(type_name(member) for member in hint)
+    return type_repr(hint)
+
+
+def convertible_type_name(name: str) -> bool:
+    """
+    tell whether Robot Framework knows the type ``name`` and all types
+    nested in it. Other names, like those of enums or pydantic models of
+    the library, cannot be converted to, as only the name is transferred.
+    """
+    if TypeInfo is None:
+        # Robot Framework before 7.0 resolves names by its converters
+        # pylint: disable=C0415
+        from robot.running.arguments.typeconverters import TypeConverter
+        # pylint: enable=C0415
+        return TypeConverter.converter_for(name) is not None
+    try:
+        info = TypeInfo.from_string(name)
+    except (DataError, ValueError):
+        return False
+
+    def known(info):
+        return (info.type is not None and
+                all(known(nested) for nested in info.nested or ()))
+
+    return known(info)
+
+
+def types_specification(types):
+    """
+    return ``types``, given as dictionary by argument name or as list by
+    position, as names. ``None`` disables the argument conversion.
+    """
+    if types is None:
+        return None
+    if isinstance(types, dict):
+        return tuple(
+            (name, type_name(hint))
+            for name, hint in types.items()
+            if name != 'return' and hint is not None
+        )
+    return tuple(type_name(hint) for hint in types)
+
+
+def type_specification(function):
+    """
+    return the argument types of ``function`` as names, as given by
+    ``@keyword(types=...)`` or otherwise by its annotations
+    """
+    types = getattr(function, 'robot_types', ())
+    if types is None or types:
+        return types_specification(types)
+    return types_specification(
+        getattr(function, '__annotations__', None) or {}
+    )
+
+
+def source_specification(function):
+    """return the source of ``function`` as ``path:lineno``"""
+    try:
+        function = inspect.unwrap(function)
+        path = inspect.getsourcefile(function)
+        _, lineno = inspect.getsourcelines(function)
+    except (TypeError, OSError):
+        return None
+    if not path:
+        return None
+    return f'{path}:{lineno}'
+
+
+def keyword_specification(name: str, function):
+    """
+    return ``(name, arguments, types, documentation, tags, source)``
+    of ``function`` which is provided as keyword ``name``
+    """
+    return (
+        name,
+        argument_specification(function),
+        type_specification(function),
+        inspect.getdoc(function) or '',
+        tuple(getattr(function, 'robot_tags', ())),
+        source_specification(function),
+    )
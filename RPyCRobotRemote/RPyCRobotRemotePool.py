@@ -0,0 +1,139 @@
+"""
+Connection pool shared by RPyCRobotRemote client instances
+
+Library instances importing the same remote with the same configuration,
+e.g. under different aliases, share one connection instead of connecting
+each on its own. Connections are reference counted and closed once they
+were not used for ``idle_timeout`` seconds or the pool runs full.
+"""
+import threading
+import time
+from typing import Optional
+
+
+class ConnectionPool:
+    """
+    Process wide pool of connections identified by a hashable key
+
+    :param max_size:      maximum number of connections kept in the pool.
+                          Connections requested while the pool is full of
+                          connections in use are not shared.
+    :param idle_timeout:  seconds an unused connection is kept open,
+                          ``None`` keeps it open until the pool is closed.
+    """
+
+    def __init__(self, max_size: int = 16,
+                 idle_timeout: Optional[float] = 60):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._created = 0
+        self._reused = 0
+        self._evicted = 0
+
+    def acquire(self, key, connect):
+        """
+        return a connection for ``key``, reusing a pooled one if possible.
+        ``connect`` is called without arguments to create a new one.
+        """
+        with self._lock:
+            expired = self._expire()
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not entry[0].closed:
+                    entry[1] += 1
+                    self._reused += 1
+                    conn = entry[0]
+                else:
+                    del self._entries[key]
+                    entry = None
+        self._close(expired)
+        if entry is not None:
+            return conn
+
+        conn = connect()
+        expired = []
+        with self._lock:
+            self._created += 1
+            if key in self._entries:
+                # connected concurrently, this one is not shared
+                return conn
+            if len(self._entries) >= self.max_size:
+                expired = self._evict_idle()
+            if len(self._entries) < self.max_size:
+                self._entries[key] = [conn, 1, None]
+        self._close(expired)
+        return conn
+
+    def release(self, conn):
+        """give back a connection returned by ``acquire``"""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry[0] is conn:
+                    entry[1] -= 1
+                    if not entry[1]:
+                        entry[2] = time.monotonic()
+                    break
+            else:
+                # connection was not pooled, nobody else uses it
+                entry = None
+            expired = self._expire()
+        if entry is None:
+            expired.append(conn)
+        self._close(expired)
+
+    def close(self):
+        """close all pooled connections"""
+        with self._lock:
+            expired = [entry[0] for entry in self._entries.values()]
+            self._entries.clear()
+        self._close(expired)
+
+    @property
+    def statistics(self):
+        """Snapshot of the number of connections pooled, created and reused"""
+        with self._lock:
+            return {
+                'pooled': len(self._entries),
+                'in_use': sum(1 for entry in self._entries.values()
+                              if entry[1]),
+                'created': self._created,
+                'reused': self._reused,
+                'evicted': self._evicted,
+            }
+
+    def _expire(self):
+        """remove connections idle for too long, returns them for closing"""
+        if self.idle_timeout is None:
+            return []
+        deadline = time.monotonic() - self.idle_timeout
+        return self._remove(
+            key for key, (_, refs, idle) in self._entries.items()
+            if not refs and idle <= deadline
+        )
+
+    def _evict_idle(self):
+        """remove the connection unused for the longest time"""
+        idle = [key for key, entry in self._entries.items() if not entry[1]]
+        if not idle:
+            return []
+        return self._remove(
+            (min(idle, key=lambda key: self._entries[key][2]), )
+        )
+
+    def _remove(self, keys):
+        removed = [self._entries.pop(key)[0] for key in list(keys)]
+        self._evicted += len(removed)
+        return removed
+
+    @staticmethod
+    def _close(connections):
+        for conn in connections:
+            try:
+                conn.close()
+            except EOFError:
+                pass
+
+
+connection_pool = ConnectionPool()
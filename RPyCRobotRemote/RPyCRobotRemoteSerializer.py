@@ -0,0 +1,200 @@
+"""
+Serializer to transfer objects by value between RPyCRobotRemote client
+and server
+
+Only types registered with a :class:`Serializer` are transferred by value.
+Everything else is still transferred as netref. Objects are converted into
+a tree of tuples and primitive values, which is then encoded using
+``brine``, the compact binary format of RPyC itself.
+"""
+import contextlib
+import functools
+from rpyc.core import brine
+
+_LIST, _TUPLE, _DICT, _SET, _FROZENSET, _OBJECT, _RAW = range(7)
+
+CONTAINERS = {
+    list: _LIST,
+    tuple: _TUPLE,
+    dict: _DICT,
+    set: _SET,
+    frozenset: _FROZENSET,
+}
+
+SEQUENCES = {
+    _LIST: list,
+    _TUPLE: tuple,
+    _SET: set,
+    _FROZENSET: frozenset,
+}
+
+
+class NotSerializable(Exception):
+    """raised in case an object cannot be transferred by value"""
+
+
+def get_state(obj):
+    """return the attributes of ``obj`` as dictionary"""
+    state = {}
+    for klass in reversed(type(obj).__mro__):
+        slots = getattr(klass, '__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots, )
+        for slot in slots:
+            if slot in ('__dict__', '__weakref__'):
+                continue
+            try:
+                state[slot] = getattr(obj, slot)
+            except AttributeError:
+                pass
+    state.update(getattr(obj, '__dict__', {}))
+    return state
+
+
+def set_state(cls, state):
+    """create an instance of ``cls`` from attributes returned by get_state"""
+    obj = cls.__new__(cls)
+    for name, value in state.items():
+        object.__setattr__(obj, name, value)
+    return obj
+
+
+def default_codec(cls):
+    """return encode and decode functions suitable for ``cls``"""
+    if (callable(getattr(cls, 'model_dump', None)) and
+            callable(getattr(cls, 'model_validate', None))):
+        # pydantic models
+        return cls.model_dump, cls.model_validate
+    return get_state, functools.partial(set_state, cls)
+
+
+@contextlib.contextmanager
+def _visiting(obj, active):
+    """mark ``obj`` as being encoded, raises ``NotSerializable`` on cycles"""
+    key = id(obj)
+    if key in active:
+        raise NotSerializable(type(obj))
+    active.add(key)
+    try:
+        yield
+    finally:
+        active.discard(key)
+
+
+class Serializer:
+    """
+    Registry of types which are transferred by value
+
+    Builtin containers (``list``, ``tuple``, ``dict``, ``set``,
+    ``frozenset``) are transferred as such. Other types are transferred
+    only if the receiving party registered them with the same name.
+    Dataclasses, classes using ``__slots__`` or ``__dict__`` and pydantic
+    models are supported without giving ``encode`` and ``decode``.
+    """
+
+    __slots__ = ('_by_type', '_by_name', '_names')
+
+    def __init__(self):
+        self._by_type = {}
+        self._by_name = {}
+        self._names = ()
+
+    def register(self, cls, /, encode=None, decode=None, *, name=None):
+        """
+        register ``cls`` to be transferred by value
+
+        :param encode:  function returning the state of an instance.
+                        The state itself must be transferable by value.
+        :param decode:  function creating an instance from its state.
+        :param name:    name identifying the type on both parties.
+                        Defaults to the qualified name of ``cls``.
+        """
+        if cls in CONTAINERS:
+            self._by_type[cls] = None
+            return cls
+        if encode is None or decode is None:
+            default_encode, default_decode = default_codec(cls)
+            encode = encode or default_encode
+            decode = decode or default_decode
+        if name is None:
+            name = f'{cls.__module__}.{cls.__qualname__}'
+        self._by_type[cls] = (name, encode)
+        self._by_name[name] = decode
+        self._names = tuple(sorted(self._by_name))
+        return cls
+
+    def names(self):
+        """return the names of all registered types besides containers"""
+        return self._names
+
+    def dumps(self, obj, accepted=None) -> bytes:
+        """
+        encode ``obj``, raises ``NotSerializable`` in case it contains
+        objects which are not registered or not in ``accepted`` names
+        or in case it references itself
+        """
+        try:
+            return brine.dump(self._encode(obj, accepted, False, set()))
+        except RecursionError as e:
+            raise NotSerializable(type(obj)) from e
+
+    def loads(self, data: bytes):
+        """decode an object encoded by ``dumps``"""
+        return self._decode(brine.load(data))
+
+    def _encode(self, obj, accepted, state, active):
+        """
+        return the tree of ``obj``. ``active`` holds the ids of the
+        containers and objects currently encoded to detect cycles.
+        """
+        cls = type(obj)
+        tag = CONTAINERS.get(cls)
+        if tag is not None:
+            if tag in (_TUPLE, _FROZENSET):
+                if brine.dumpable(obj):
+                    return (_RAW, obj)
+            elif not state and cls not in self._by_type:
+                raise NotSerializable(cls)
+            with _visiting(obj, active):
+                if tag == _DICT:
+                    items = obj.items()
+                    return (tag, tuple(
+                        (self._encode(key, accepted, state, active),
+                         self._encode(value, accepted, state, active))
+                        for key, value in items
+                    ))
+                return (tag, tuple(
+                    self._encode(item, accepted, state, active)
+                    for item in obj
+                ))
+        if brine.dumpable(obj):
+            return obj
+
+        entry = self._by_type.get(cls)
+        if entry is None:
+            raise NotSerializable(cls)
+        name, encode = entry
+        if accepted is not None and name not in accepted:
+            raise NotSerializable(cls)
+        with _visiting(obj, active):
+            return (_OBJECT, name,
+                    self._encode(encode(obj), accepted, True, active))
+
+    def _decode(self, node):
+        if not isinstance(node, tuple):
+            return node
+        tag, items = node[0], node[1]
+        if tag == _RAW:
+            return items
+        if tag == _OBJECT:
+            _, name, state = node
+            return self._by_name[name](self._decode(state))
+        if tag == _DICT:
+            return {
+                self._decode(key): self._decode(value)
+                for key, value in items
+            }
+        return SEQUENCES[tag](self._decode(item) for item in items)
+
+
+serializer = Serializer()
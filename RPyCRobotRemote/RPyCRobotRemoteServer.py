@@ -1,16 +1,36 @@
 """
 Server Implementation for RPyCRobotRemote
 """
+# pylint: disable=too-many-lines
+import os
 import sys
+import stat
 import pathlib
 import logging
 import io
+import functools
+import hashlib
 import inspect
+import itertools
+import asyncio
+import contextvars
+import signal
+import socket
 import threading
+import queue
+import time
+import pickle
+import json
+import statistics as _statistics
 from typing import TextIO, Optional, Union
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Iterator
 from robot.api import logger as robotapilogger
-from robot.libraries.DateTime import convert_time
+from robot.utils import (
+    get_error_message,
+    safe_str,
+    timestr_to_secs,
+)
 import rpyc
 # pylint: disable=E0611
 from rpyc.lib.compat import execute
@@ -18,6 +38,28 @@ from rpyc.lib import spawn
 # pylint: enable=E0611
 from rpyc.utils.helpers import classpartial
 from rpyc.utils.server import Server as _RPyCServer
+from rpyc.core import brine, vinegar
+from .RPyCRobotRemoteKeywords import (
+    keyword_specification,
+    types_specification,
+)
+from .RPyCRobotRemoteSerializer import (
+    Serializer,
+    NotSerializable,
+    serializer as default_serializer,
+)
+from .RPyCRobotRemoteCompression import (
+    CODECS,
+    CompressingChannel,
+    CompressionStatistics,
+    compression_ratio,
+)
+from .RPyCRobotRemoteSharedMemory import (
+    SHARED_MEMORY,
+    SharedMemoryTransfer,
+    receive as receive_shared_memory,
+    shareable,
+)
 
 
 class SingleServer(_RPyCServer):
@@ -50,6 +92,12 @@ class ThreadedServer(_RPyCServer):
         self._terminated = []
         super().__init__(*args, **kwargs)
 
+    @property
+    def statistics(self):
+        """Snapshot of the number of connection threads"""
+        with self._cond:
+            return {'workers': len(self._workers)}
+
     def close(self):
         '''closes a ThreadPoolServer. In particular, joins the thread pool.'''
         # close parent server
@@ -80,20 +128,272 @@ class ThreadedServer(_RPyCServer):
             )
 
 
+class PooledServer(_RPyCServer):  # pylint: disable=R0902
+    """
+    A server that serves connections by a fixed pool of worker threads.
+    Accepted connections wait in a queue until a worker becomes available,
+    connections exceeding ``max_connections`` are refused.
+
+    :param workers:          number of connections served concurrently
+    :param max_connections:  maximum number of connections which are either
+                             served or waiting for a worker
+
+    Other parameters: see :class:`rpyc.utils.server.Server`
+
+    Use :func:`functools.partial` to pass ``workers`` and
+    ``max_connections`` through the ``server`` parameter of
+    :class:`RPyCRobotRemoteServer`.
+    """
+    def __init__(self, *args, workers: int = 10, max_connections: int = 100,
+                 **kwargs):
+        if workers < 1 or max_connections < workers:
+            raise ValueError(
+                'workers must be positive and must not exceed max_connections'
+            )
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._workers = []
+        self._workers_count = workers
+        self._max_connections = max_connections
+        self._active = 0
+        self._queued = 0
+        self._served = 0
+        self._refused = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        super().__init__(*args, **kwargs)
+
+    def _listen(self):
+        super()._listen()
+        with self._lock:
+            while len(self._workers) < self._workers_count:
+                self._workers.append(spawn(self._serve_queue))
+
+    def close(self):
+        '''closes a PooledServer. In particular, joins the thread pool.'''
+        # close parent server
+        super().close()
+        # join the threads
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(None)
+        for w in workers:
+            w.join()
+
+    @property
+    def statistics(self):
+        """
+        Snapshot of the pool. Queue wait times are given in seconds from
+        accepting a connection until a worker starts serving it.
+        """
+        with self._lock:
+            return {
+                'workers': self._workers_count,
+                'max_connections': self._max_connections,
+                'active': self._active,
+                'queued': self._queued,
+                'served': self._served,
+                'refused': self._refused,
+                'queue_wait_total': self._queue_wait_total,
+                'queue_wait_max': self._queue_wait_max,
+            }
+
+    def _accept_method(self, sock):
+        with self._lock:
+            accept = self._active + self._queued < self._max_connections
+            if accept:
+                self._queued += 1
+            else:
+                self._refused += 1
+
+        if accept:
+            self._queue.put((sock, time.monotonic()))
+            return
+
+        self.logger.info(  # pylint: disable=logging-fstring-interpolation
+            f'Refusing connection, {self._max_connections} connections '
+            'are served or waiting already'
+        )
+        self.clients.discard(sock)
+        sock.close()
+
+    def _serve_queue(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            sock, accepted = item
+            wait = time.monotonic() - accepted
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._served += 1
+                self._queue_wait_total += wait
+                self._queue_wait_max = max(self._queue_wait_max, wait)
+            try:
+                self._authenticate_and_serve_client(sock)
+            except BaseException as e:  # noqa: E501 pylint: disable=broad-exception-caught
+                self.logger.info(  # noqa: E501 pylint: disable=logging-fstring-interpolation
+                    f'Exception during handling connection: {e!r}'
+                )
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+
+class PreforkServer(ThreadedServer):
+    """
+    A server that forks a fixed number of worker processes sharing the
+    listening socket. Each worker serves its connections like
+    :class:`ThreadedServer` with its own copy of the library instance.
+    Workers terminating unexpectedly are restarted. Stopping the server
+    from remote in any worker stops all workers. Available on POSIX
+    compatible systems only.
+
+    :param processes:  number of worker processes, defaults to the
+                       number of CPUs
+
+    Other parameters: see :class:`rpyc.utils.server.Server`
+
+    Use :func:`functools.partial` to pass ``processes`` through the
+    ``server`` parameter of :class:`RPyCRobotRemoteServer`.
+    """
+    STOPPED = 3
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, *args, processes: Optional[int] = None, **kwargs):
+        if not hasattr(os, 'fork'):
+            raise OSError('PreforkServer not supported on this platform')
+        if processes is not None and processes < 1:
+            raise ValueError('processes must be positive')
+        self._processes = processes or os.cpu_count() or 1
+        self._children = set()
+        self._terminated_by_parent = False
+        super().__init__(*args, **kwargs)
+
+    def start(self):
+        """Starts the workers and supervises them until the server stops"""
+        self._listen()
+        try:
+            while self.active:
+                while len(self._children) < self._processes:
+                    self._fork()
+                time.sleep(self.POLL_INTERVAL)
+                self._reap()
+        except KeyboardInterrupt:
+            self.logger.warning('keyboard interrupt!')
+        finally:
+            self.logger.info('server has terminated')
+            self.close()
+
+    @property
+    def statistics(self):
+        """
+        Snapshot of the worker processes. Connections are served by the
+        workers, so the other statistics cover one worker process only.
+        """
+        return {
+            'processes': self._processes,
+            'running': len(self._children),
+            'pid': os.getpid(),
+        }
+
+    def close(self):
+        '''closes a PreforkServer. In particular, terminates the workers.'''
+        for pid in self._children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in self._children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self._children.clear()
+        super().close()
+
+    def _fork(self):
+        pid = os.fork()
+        if pid:
+            self._children.add(pid)
+            self.logger.info(  # pylint: disable=logging-fstring-interpolation
+                f'worker process {pid} started'
+            )
+            return
+
+        # pylint: disable=W0212
+        exitcode = 1
+        try:
+            self._children.clear()
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, self._terminate)
+            try:
+                while self.active:
+                    self.accept()
+            except EOFError:
+                pass
+            finally:
+                # the listener is shared, so it must not be shut down here
+                self.listener.close()
+                self.listener = None
+                self.close()
+            exitcode = 0 if self._terminated_by_parent else self.STOPPED
+        except BaseException:  # pylint: disable=broad-exception-caught
+            self.logger.exception('worker process terminated abnormally')
+        finally:
+            os._exit(exitcode)
+        # pylint: enable=W0212
+
+    def _terminate(self, signum, frame):  # pylint: disable=unused-argument
+        self._terminated_by_parent = True
+        self.active = False
+
+    def _reap(self):
+        for pid in list(self._children):
+            try:
+                finished, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                finished, status = pid, 0
+            if not finished:
+                continue
+            self._children.discard(pid)
+            exitcode = os.waitstatus_to_exitcode(status)
+            if exitcode == self.STOPPED:
+                self.logger.info(  # noqa: E501 pylint: disable=logging-fstring-interpolation
+                    f'worker process {pid} stopped the server'
+                )
+                self.active = False
+            else:
+                self.logger.warning(  # noqa: E501 pylint: disable=logging-fstring-interpolation
+                    f'worker process {pid} terminated with {exitcode}'
+                )
+
+
 LOGGER = logging.getLogger('RPyCRobotRemote.Server')
 LOGGER.setLevel(logging.INFO)
 del LOGGER
 
-UNDEFINED = object()
+LISTENER_TIMEOUT = 0.5
+
+# ``by_value`` of keyword results handed out by a ``ResultStream``
+STREAM = 'stream'
 
 
 class WrapTheadSpecific:
-    """generic wrapper for any kind of object which makes it thread specific"""
+    """
+    generic wrapper for any kind of object which makes it thread specific
 
-    __slots__ = ('_local', '_default')
+    The instance is kept in a context variable. Threads start with an empty
+    context, while coroutines inherit the context of the keyword which
+    awaits them.
+    """
+
+    __slots__ = ('_var', '_default')
 
     def __init__(self, default=None):
-        super().__setattr__('_local', threading.local())
+        super().__setattr__('_var', contextvars.ContextVar('instance'))
         super().__setattr__('_default', default)
 
     @property
@@ -124,7 +424,7 @@ class WrapTheadSpecific:
         return repr(self.get_thread_specific_instance())
 
     def __getattr__(self, item):
-        return getattr(self.get_thread_specific_instance(), item)
+        return getattr(self._var.get(self._default), item)
 
     def __setattr__(self, item, value):
         return setattr(self.get_thread_specific_instance(), item, value)
@@ -139,7 +439,7 @@ class WrapTheadSpecific:
         return self.get_thread_specific_instance().__reduce_ex__(protocol)
 
     def __call__(self, *args, **kwargs):
-        return self.get_thread_specific_instance()(*args, **kwargs)
+        return self._var.get(self._default)(*args, **kwargs)
 
     def __format__(self, format_spec):
         return self.get_thread_specific_instance().__format__(format_spec)
@@ -164,23 +464,414 @@ class WrapTheadSpecific:
 
     def get_thread_specific_instance(self, /):
         """return the thread specific instance stored in the wrapper"""
-        return getattr(self._local, 'value', self._default)
+        return self._var.get(self._default)
 
     def set_thread_specific_instance(self, /, obj):
         """sets the thread specific instance stored in the wrapper"""
-        self._local.value = obj
+        self._var.set(obj)
 
     def unset_thread_specific_instance(self, /):
         """unsets the thread specific instance stored in the wrapper"""
+        self._var.set(self._default)
+
+
+class ThreadSpecificStream(WrapTheadSpecific):
+    """
+    thread specific wrapper for text streams
+
+    Writing is what happens most to ``sys.stdout`` and ``sys.stderr``, also
+    in threads unrelated to any connection. So the methods doing it are
+    defined here instead of being resolved by ``__getattr__`` after the
+    regular attribute lookup failed, which is several times slower.
+    """
+
+    __slots__ = ()
+
+    def write(self, text):
+        """write ``text`` to the thread specific stream"""
+        return self._var.get(self._default).write(text)
+
+    def writelines(self, lines):
+        """write ``lines`` to the thread specific stream"""
+        return self._var.get(self._default).writelines(lines)
+
+    def flush(self):
+        """flush the thread specific stream"""
+        return self._var.get(self._default).flush()
+
+
+class ServerStatistics:
+    """
+    collects connection and keyword statistics of a server
+
+    Recording a keyword call only updates a few counters. Percentiles are
+    computed on request from a window of the most recent durations.
+
+    With :class:`PreforkServer` each worker process has statistics of its
+    own, so they cover the connections and calls of the worker serving
+    the request only. ``running`` of the server statistics is always ``0``
+    there, as the workers have no child processes.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._window = window
+        self._started = time.monotonic()
+        self._connections = set()
+        self._connections_total = 0
+        self._compression = CompressionStatistics()
+        self._keywords = {}
+
+    def connected(self, conn):
+        """count the new connection ``conn``"""
+        with self._lock:
+            self._connections.add(conn)
+            self._connections_total += 1
+
+    def disconnected(self, conn):
+        """forget the closed connection ``conn``"""
+        with self._lock:
+            self._connections.discard(conn)
+            channel = compression_statistics(conn)
+            if channel is not None:
+                self._compression.add(channel)
+
+    def record(self, name: str, duration: float, failed: bool):
+        """count a call of keyword ``name`` which took ``duration``"""
+        with self._lock:
+            keyword = self._keywords.get(name)
+            if keyword is None:
+                keyword = self._keywords[name] = [
+                    0, 0, 0.0, 0.0, deque(maxlen=self._window)
+                ]
+            keyword[0] += 1
+            keyword[1] += failed
+            keyword[2] += duration
+            keyword[3] = max(keyword[3], duration)
+            keyword[4].append(duration)
+
+    def snapshot(self, server=None):
+        """
+        return the statistics as dictionary, including those provided by
+        the ``statistics`` property of ``server`` if available
+        """
+        with self._lock:
+            connections = list(self._connections)
+            connections_total = self._connections_total
+            compression = CompressionStatistics()
+            compression.add(self._compression)
+            keywords = [(name, calls, failures, total, longest, list(window))
+                        for name, (calls, failures, total, longest, window)
+                        in self._keywords.items()]
+
+        local_objects = proxies = 0
+        for conn in connections:
+            objects, cached = netref_counts(conn)
+            local_objects = add_count(local_objects, objects)
+            proxies = add_count(proxies, cached)
+            channel = compression_statistics(conn)
+            if channel is not None:
+                compression.add(channel)
+
+        return {
+            'uptime': time.monotonic() - self._started,
+            # threads of the whole process, not only of the server
+            'process_threads': threading.active_count(),
+            'connections': {
+                'active': len(connections),
+                'total': connections_total,
+            },
+            'netrefs': {
+                'local_objects': local_objects,
+                'proxies': proxies,
+            },
+            'compression': {
+                name: getattr(compression, name)
+                for name in CompressionStatistics.__slots__
+            } | {'ratio': compression_ratio(compression)},
+            'server': dict(getattr(server, 'statistics', None) or {}),
+            'keywords': {
+                name: {
+                    'calls': calls,
+                    'failures': failures,
+                    'time': total,
+                    'max_time': longest,
+                    **percentiles(window),
+                }
+                for name, calls, failures, total, longest, window in keywords
+            },
+        }
+
+
+def connection_attribute(conn, name: str):
+    """
+    return the private attribute ``name`` of the RPyC ``Connection``
+    ``conn`` or ``None`` if the installed RPyC version has no such one
+    """
+    return getattr(conn, f'_Connection__{name}', None)
+
+
+def netref_counts(conn):
+    """
+    return the number of local objects referenced by the other party of
+    ``conn`` and of proxies for its objects, each ``None`` if unavailable
+    """
+    objects = getattr(connection_attribute(conn, 'local_objects'), '_dict',
+                      None)
+    proxies = connection_attribute(conn, 'proxy_cache')
+    return (
+        None if objects is None else len(objects),
+        None if proxies is None else len(proxies),
+    )
+
+
+def add_count(total, count):
+    """add ``count`` to ``total``, which stay ``None`` once unavailable"""
+    if total is None or count is None:
+        return None
+    return total + count
+
+
+def compression_statistics(conn):
+    """
+    return the counters of the channel of ``conn`` if it negotiated
+    compression, otherwise ``None``
+    """
+    channel = connection_attribute(conn, 'channel')
+    if isinstance(channel, CompressingChannel):
+        return channel.statistics
+    return None
+
+
+def percentiles(samples):
+    """return median, 90th and 99th percentile of ``samples``"""
+    if len(samples) < 2:
+        return {'p50': samples[0], 'p90': samples[0], 'p99': samples[0]}
+    quantiles = _statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50': quantiles[49], 'p90': quantiles[89], 'p99': quantiles[98]}
+
+
+class EventLoopThread:
+    """
+    asyncio event loop running in a background thread, which awaits
+    coroutines returned by keywords. The loop is started on first use.
+
+    Each connection has a loop of its own, so a synchronous call to the
+    client made by a coroutine, e.g. forwarding output or log messages
+    once a buffer is full or using a netref argument, only blocks the
+    other coroutines of the same client until it replied.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+    def run(self, awaitable):
+        """await ``awaitable`` in the event loop and return its result"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = spawn(self._loop.run_forever)
+            loop = self._loop
+        # the context of the calling thread is inherited by the task
+        return asyncio.run_coroutine_threadsafe(
+            wait_for(awaitable), loop
+        ).result()
+
+    def close(self):
+        """
+        stop the event loop and wait for the background thread, coroutines
+        still running are cancelled
+        """
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
         try:
-            del self._local.value
-        except AttributeError:
-            pass
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(
+                asyncio.gather(*tasks, return_exceptions=True)
+            )
+        finally:
+            loop.close()
+
+
+async def wait_for(awaitable):
+    """return the result of ``awaitable``"""
+    return await awaitable
+
+
+class OutputBuffer:
+    """
+    collects writes to several streams and forwards them in chunks
+    while keeping the order between the streams. Size and age of the
+    collected writes are only checked on the next write, whatever is
+    left has to be forwarded by calling ``flush``.
+    """
+
+    __slots__ = ('_size', '_interval', '_pending', '_length', '_deadline')
+
+    def __init__(self, size: int, interval: float):
+        self._size = size
+        self._interval = interval
+        self._pending = []
+        self._length = 0
+        self._deadline = None
+
+    def write(self, stream, text: str):
+        """queue ``text`` for ``stream`` and flush if a threshold is reached"""
+        if self._pending and self._pending[-1][0] is stream:
+            self._pending[-1][1].append(text)
+        else:
+            self._pending.append((stream, [text]))
+        self._length += len(text)
+        if self._deadline is None:
+            self._deadline = time.monotonic() + self._interval
+        if (self._length >= self._size or
+                time.monotonic() >= self._deadline):
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        """forward all queued writes to their streams"""
+        pending, self._pending = self._pending, []
+        self._length = 0
+        self._deadline = None
+        for stream, chunks in pending:
+            stream.write(''.join(chunks))
+
+
+class BufferedStream:
+    """text stream which forwards its writes through an ``OutputBuffer``"""
+
+    __slots__ = ('_buffer', '_stream')
+
+    def __init__(self, buffer: OutputBuffer, stream: TextIO):
+        self._buffer = buffer
+        self._stream = stream
+
+    def __getattr__(self, item):
+        return getattr(self._stream, item)
+
+    def write(self, text: str):
+        """queue ``text`` in the output buffer"""
+        return self._buffer.write(self._stream, text)
+
+    def writelines(self, lines):
+        """queue all ``lines`` in the output buffer"""
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        """forward the output buffer and flush the underlying stream"""
+        self._buffer.flush()
+        self._stream.flush()
+
+
+class LogBuffer:
+    """
+    collects ``robot.api.logger`` messages together with their timestamps
+    and forwards them as one batch
+    """
+
+    __slots__ = ('_size', '_replay', '_pending')
+
+    def __init__(self, size: int, replay: Callable):
+        self._size = size
+        self._replay = replay
+        self._pending = []
+
+    def write(self, msg, level='INFO', html=False, console=None):
+        """replacement for ``robot.api.logger.write``"""
+        if level == 'FAIL':
+            raise ValueError(f"Invalid log level '{level}'.")
+        self._append('write', (safe_str(msg), level, html, console))
+
+    def console(self, msg, newline=True, stream='stdout'):
+        """replacement for ``robot.api.logger.console``"""
+        self._append('console', (safe_str(msg), newline, stream))
+
+    def _append(self, kind: str, args: tuple):
+        self._pending.append((kind, time.time(), args))
+        if len(self._pending) >= self._size:
+            self.flush()
+
+    def flush(self):
+        """forward all queued messages in one call"""
+        pending, self._pending = self._pending, []
+        if pending:
+            self._replay(tuple(pending))
+
+
+class CapturedStream:
+    """text stream which collects its writes as records like ``LogBuffer``"""
+
+    __slots__ = ('_records', '_kind')
+
+    def __init__(self, records: list, kind: str):
+        self._records = records
+        self._kind = kind
+
+    def write(self, text: str):
+        """collect ``text`` together with the current time"""
+        self._records.append((self._kind, time.time(), (text, )))
+        return len(text)
+
+    def writelines(self, lines):
+        """collect all ``lines``"""
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        """nothing to do, all writes are collected already"""
+
+
+class ResultStream:
+    """
+    iterator returned by a keyword which is handed out in chunks, so the
+    client needs one request per chunk instead of one per item
+    """
+
+    __slots__ = ('_iterator', '_chunk_size', '_encode')
+
+    def __init__(self, iterator: Iterator, chunk_size: int,
+                 encode: Callable):
+        self._iterator = iterator
+        self._chunk_size = chunk_size
+        self._encode = encode
+
+    def next_chunk(self):
+        """
+        return ``(by_value, items, done)`` with up to ``chunk_size`` items
+        encoded like keyword results. ``done`` tells that the iterator is
+        exhausted.
+        """
+        items = tuple(itertools.islice(self._iterator, self._chunk_size))
+        return self._encode(items) + (len(items) < self._chunk_size, )
+
+    def close(self):
+        """stop a generator which was not iterated to its end"""
+        close = getattr(self._iterator, 'close', None)
+        if close is not None:
+            close()
+
+
+def is_streamable(result) -> bool:
+    """return True in case ``result`` can be streamed in chunks"""
+    # results may deny access to __class__, so inspect the type
+    return (issubclass(type(result), Iterator) and
+            not isinstance(result, io.IOBase))
 
 
 _stdin = WrapTheadSpecific(sys.stdin)
-_stdout = WrapTheadSpecific(sys.stdout)
-_stderr = WrapTheadSpecific(sys.stderr)
+_stdout = ThreadSpecificStream(sys.stdout)
+_stderr = ThreadSpecificStream(sys.stderr)
 sys.stdin = _stdin
 sys.stdout = _stdout
 sys.stderr = _stderr
@@ -195,12 +886,13 @@ class RPyCRobotRemoteServer:
     """
     Implements Remote Sever Interface for Robot Framework based on RPyC
     """
-    # pylint: disable=R0913,R0914
+    # pylint: disable=R0913,R0914,R0915
     def __init__(self,  # noqa, C901 allow higher complexity here
                  library,
                  host: Optional[str] = 'localhost',
                  port: int = 18861, *,
                  port_file: Optional[Union[str, pathlib.Path, TextIO]] = None,
+                 socket_path: Optional[Union[str, pathlib.Path]] = None,
                  serve: bool = True,
                  allow_remote_stop: bool = True,
                  ipv6: bool = False,
@@ -208,10 +900,20 @@ class RPyCRobotRemoteServer:
                  timeout=None,
                  logger=None,
                  server=None,
+                 output_buffer_size: int = 65536,
+                 output_flush_interval=1,
+                 log_buffer_size: int = 1000,
+                 serializer: Optional[Serializer] = None,
+                 compression=tuple(CODECS),
                  **rpyc_config):
         """Configure and start-up remote server.
 
         :param library:     Test library instance or module to host.
+                            Keywords returning a coroutine are awaited on
+                            an event loop of their connection. Calls to
+                            the client from a coroutine, like using netref
+                            arguments or forwarding output, block that
+                            loop until the client replied.
         :param host:        Address to listen. Use None to listen
                             to all available interfaces.
         :param port:        Port to listen. Use ``0`` to select a free port
@@ -220,7 +922,13 @@ class RPyCRobotRemoteServer:
         :param port_file:   File to write the port that is used. ``None`` means
                             no such file is written. Port file is created after
                             the server is started and removed automatically
-                            after it has stopped.
+                            after it has stopped. When listening to a Unix
+                            domain socket, its path is written instead.
+        :param socket_path: Path of a Unix domain socket to listen to instead
+                            of ``host`` and ``port``. Avoids the TCP stack
+                            for clients on the same machine. A stale socket
+                            left at this path is replaced and the socket is
+                            removed after the server has stopped.
         :param serve:       If ``True``, start the server automatically and
                             wait for it to be stopped.
         :param allow_remote_stop:  Allow/disallow stopping the server using
@@ -228,13 +936,47 @@ class RPyCRobotRemoteServer:
                             ``stop_remote_server`` method.
         :param ipv6         If ``True``, allow IPv6 connections,
                             if ``False``, use IPv4 only connections.
+        :param server:      Server class used to accept connections,
+                            e.g. ``SingleServer``, ``ThreadedServer``
+                            (default), ``PooledServer`` or ``PreforkServer``.
+        :param output_buffer_size:  Number of characters written to
+                            ``stdout`` and ``stderr`` during a keyword which
+                            are collected before they are forwarded to the
+                            client. ``0`` forwards every write immediately.
+        :param output_flush_interval:  Time after which collected output is
+                            forwarded to the client. It is checked on each
+                            write, output still collected when the keyword
+                            finishes is forwarded at its end.
+        :param log_buffer_size:  Number of ``robot.api.logger`` messages
+                            collected before they are forwarded to clients
+                            which enabled batched logging.
+        :param serializer:  Registry of types which keywords return and
+                            accept by value instead of as netref. Defaults
+                            to the registry shared within the process.
+                            Pickled arguments are only accepted if
+                            ``allow_pickle=True`` is given as well.
+        :param compression: Codecs clients may negotiate to compress the
+                            frames of their connection, out of ``none``,
+                            ``zlib`` and ``lzma``. Connections which do
+                            not negotiate use the ``zlib`` default of RPyC.
         """
-        class Service(rpyc.Service):
+        class Service(rpyc.Service):  # pylint: disable=R0902,R0904
             """The root service provided"""
             def __init__(self, library):
                 super().__init__()
                 self.namespace = {}
                 self._library = library
+                self._keywords = None
+                self._dynamic_keywords = None
+                self._fingerprint = None
+                # keywords started in threads of their own redirect too
+                self._redirected = contextvars.ContextVar(
+                    'redirected', default=()
+                )
+                self._shared_memory = SharedMemoryTransfer()
+                self._installed_sinks = None
+                self._eventloop = EventLoopThread()
+                self._conn = None
 
             if allow_remote_stop:
                 @staticmethod
@@ -243,6 +985,8 @@ class RPyCRobotRemoteServer:
                     self.stop()
 
             def on_connect(self, conn):
+                self._conn = conn
+                statistics.connected(conn)
                 on_connect = getattr(self._library, '_on_connect', None)
                 if on_connect:
                     on_connect()
@@ -255,8 +999,13 @@ class RPyCRobotRemoteServer:
                 _robotapilogconsole.unset_thread_specific_instance()
 
                 on_disconnect = getattr(self._library, '_on_disconnect', None)
-                if on_disconnect:
-                    on_disconnect()
+                try:
+                    if on_disconnect:
+                        on_disconnect()
+                finally:
+                    self._shared_memory.release()
+                    self._eventloop.close()
+                    statistics.disconnected(conn)
 
             def execute(self, text):
                 """execute arbitrary code (using ``exec``)"""
@@ -289,6 +1038,398 @@ class RPyCRobotRemoteServer:
                         not getattr(value, 'robot_not_keyword', False))
                 )
 
+            def get_keyword_specifications(self):
+                """
+                return names, arguments, types, documentation, tags and
+                source of all keywords in one call
+                """
+                if is_dynamic_library(self._library):
+                    return tuple(
+                        dynamic_keyword_specification(self._library, name)
+                        for name in self.get_keyword_names()
+                    )
+                return tuple(
+                    keyword_specification(name, function)
+                    for name, function in self._get_keywords().items()
+                )
+
+            def get_library_fingerprint(self):
+                """
+                return a digest of the keyword specifications, which a
+                client compares after reconnecting to keep its own copy
+                """
+                if self._fingerprint is None:
+                    self._fingerprint = hashlib.sha256(
+                        repr(self.get_keyword_specifications()).encode()
+                    ).hexdigest()
+                return self._fingerprint
+
+            # keyword calls are forwarded with positional arguments only
+            # pylint: disable=R0917
+            def run_keyword(self, name, args, kwargs,
+                            accepted=(), encoded=(), shared_memory=None,
+                            chunk_size=None, redirect=False):
+                """
+                run keyword ``name`` of the library and return
+                ``(by_value, result)``. If ``by_value`` is ``True``,
+                ``result`` was encoded by the serializer, as all types
+                contained in it are registered and listed in ``accepted``.
+                If it is ``shared_memory``, ``result`` is the descriptor of
+                a shared memory segment holding binary data of at least
+                ``shared_memory`` bytes. If it is ``stream``, ``result`` is
+                a ``ResultStream`` handing out an iterator returned by the
+                keyword in chunks of ``chunk_size`` items.
+
+                ``encoded`` lists the positions or names of arguments
+                passed by value together with their encoding, which is
+                either ``serializer``, ``pickle`` or ``shared_memory``.
+
+                With ``redirect``, the output sinks installed by
+                ``install_redirect`` are used while the keyword runs.
+                """
+                if redirect:
+                    self.redirect(*self._installed_sinks)
+                start = time.perf_counter()
+                failed = True
+                try:
+                    result = self._run_keyword(
+                        name, args, kwargs, accepted, encoded, shared_memory,
+                        chunk_size
+                    )
+                    failed = False
+                    return result
+                finally:
+                    # calls of unknown names must not grow the statistics
+                    if self._is_keyword(name):
+                        statistics.record(
+                            name, time.perf_counter() - start, failed
+                        )
+                    if redirect:
+                        self.restore()
+
+            def _run_keyword(self, name, args, kwargs, accepted, encoded,
+                             shared_memory, chunk_size):
+                if encoded:
+                    args, kwargs = self._decode_arguments(
+                        args, kwargs, encoded
+                    )
+                if is_dynamic_library(self._library):
+                    if kwargs:
+                        result = self._library.run_keyword(
+                            name, list(args), dict(kwargs)
+                        )
+                    else:
+                        result = self._library.run_keyword(name, list(args))
+                else:
+                    function = self._get_keywords().get(name)
+                    if function is None:
+                        function = getattr(self._library, name)
+                    result = function(*args, **dict(kwargs))
+                # results may deny access to __class__, so inspect the type
+                if hasattr(type(result), '__await__'):
+                    result = self._eventloop.run(result)
+
+                if chunk_size is not None and is_streamable(result):
+                    return STREAM, ResultStream(
+                        result,
+                        chunk_size,
+                        functools.partial(self._encode_result,
+                                          accepted=accepted),
+                    )
+                return self._encode_result(result, accepted, shared_memory)
+
+            def _encode_result(self, result, accepted, shared_memory=None):
+                """return ``(by_value, result)`` as for ``run_keyword``"""
+                if (shared_memory is not None and
+                        shareable(result, shared_memory)):
+                    return SHARED_MEMORY, self._shared_memory.share(result)
+                if not brine.dumpable(result):
+                    try:
+                        return True, serializer.dumps(result, accepted)
+                    except NotSerializable:
+                        pass
+                return False, result
+
+            def run_keywords(self, calls, stop_on_failure=True,
+                             accepted=(), shared_memory=None,
+                             chunk_size=None, redirect=False):
+                """
+                run ``calls`` given as ``(name, args, kwargs, encoded)``
+                one after the other and return ``(passed, outcome)`` for
+                each call executed. ``outcome`` is ``(by_value, result)``
+                as returned by ``run_keyword`` or the error message.
+                ``redirect`` is applied as by ``run_keyword``.
+                """
+                if redirect:
+                    self.redirect(*self._installed_sinks)
+                try:
+                    return self._run_keywords(
+                        calls, stop_on_failure, accepted, shared_memory,
+                        chunk_size
+                    )
+                finally:
+                    if redirect:
+                        self.restore()
+
+            def _run_keywords(self, calls, stop_on_failure, accepted,
+                              shared_memory, chunk_size):
+                outcomes = []
+                for name, args, kwargs, encoded in calls:
+                    try:
+                        outcomes.append((True, self.run_keyword(
+                            name, args, kwargs, accepted, encoded,
+                            shared_memory, chunk_size
+                        )))
+                    except Exception:  # pylint: disable=W0718
+                        outcomes.append((False, get_error_message()))
+                        if stop_on_failure:
+                            break
+                return tuple(outcomes)
+
+            def run_keyword_captured(self, name, args, kwargs,
+                                     accepted=(), encoded=(),
+                                     shared_memory=None, chunk_size=None):
+                """
+                run keyword ``name`` like ``run_keyword``, but collect
+                its output instead of forwarding it and return
+                ``(output, by_value, result)``. ``output`` holds records
+                as handed over to ``robotapilogreplay`` together with
+                ``stdout`` and ``stderr`` records. If the keyword fails,
+                the records are attached to the exception as
+                ``rpyc_output``.
+                """
+                records = []
+                self.redirect(
+                    CapturedStream(records, 'stdout'),
+                    CapturedStream(records, 'stderr'),
+                    None,
+                    None,
+                    records.extend,
+                )
+                try:
+                    try:
+                        result = self.run_keyword(
+                            name, args, kwargs, accepted, encoded,
+                            shared_memory, chunk_size
+                        )
+                    finally:
+                        self.restore()
+                except Exception as e:
+                    e.rpyc_output = tuple(records)
+                    raise
+                return (tuple(records), ) + result
+
+            def start_keyword_captured(self, done, name, args, kwargs,
+                                       accepted=(), encoded=(),
+                                       shared_memory=None, chunk_size=None):
+                """
+                start keyword ``name`` like ``run_keyword_captured`` in a
+                thread of its own and return at once, so that keywords
+                started one after the other run at the same time. Once it
+                finished, ``done(passed, outcome, output)`` is called with
+                ``(by_value, result)`` as ``outcome``, or the exception
+                dumped by ``rpyc.core.vinegar`` if it failed.
+                """
+                config = self._conn._config  # pylint: disable=W0212
+
+                def run():
+                    try:
+                        output, *outcome = self.run_keyword_captured(
+                            name, args, kwargs, accepted, encoded,
+                            shared_memory, chunk_size
+                        )
+                        passed = True
+                    except Exception as e:  # pylint: disable=W0718
+                        output = getattr(e, 'rpyc_output', ())
+                        outcome = vinegar.dump(
+                            type(e), e, e.__traceback__,
+                            include_local_traceback=config[
+                                'include_local_traceback'
+                            ],
+                            include_local_version=config[
+                                'include_local_version'
+                            ],
+                        )
+                        passed = False
+                    try:
+                        done(passed, tuple(outcome), output)
+                    except EOFError:
+                        # the client disconnected in the meantime
+                        pass
+
+                spawn(run)
+            # pylint: enable=R0917
+
+            @staticmethod
+            def get_server_statistics():
+                """return the statistics of the server as JSON text"""
+                return json.dumps(self.statistics)
+
+            def get_serializable_types(self):
+                """return the names of types which can be passed by value"""
+                return serializer.names()
+
+            def accepts_pickle(self):
+                """return whether pickled arguments are accepted"""
+                return config.get('allow_pickle', False)
+
+            def negotiate_compression(self, codec, threshold, level=None):
+                """
+                compress frames above ``threshold`` bytes with ``codec``
+                in both directions, return ``False`` if the codec is not
+                allowed. The client may only use it after this returned.
+                """
+                if codec not in compression:
+                    return False
+                channel = connection_attribute(self._conn, 'channel')
+                if channel is None:
+                    # unknown RPyC internals, keep its default compression
+                    return False
+                if isinstance(channel, CompressingChannel):
+                    channel.configure(codec, threshold, level)
+                else:
+                    # No frame can be read with the old channel by now: the
+                    # connection looks its channel up for each poll, recv
+                    # and send, recv is only entered once a frame arrived,
+                    # and the client sends with the new codec only after it
+                    # got the reply, which is sent through the new channel.
+                    # Neither channel nor stream buffer data between frames.
+                    setattr(self._conn, '_Connection__channel',
+                            CompressingChannel(
+                                channel.stream, CompressionStatistics(),
+                                codec, threshold, level
+                            ))
+                return True
+
+            @staticmethod
+            def probe_shared_memory(descriptor):
+                """
+                return the data of a shared memory segment created by the
+                client or ``None`` if it cannot be accessed from here
+                """
+                try:
+                    return receive_shared_memory(descriptor)
+                except (OSError, ValueError):
+                    return None
+
+            def _decode_arguments(self, args, kwargs, encoded):
+                args = list(args)
+                kwargs = dict(kwargs)
+                for key, encoding in encoded:
+                    values = args if isinstance(key, int) else kwargs
+                    if encoding == SHARED_MEMORY:
+                        values[key] = receive_shared_memory(values[key])
+                    elif encoding == 'pickle':
+                        if not config.get('allow_pickle', False):
+                            raise ValueError('pickling is disabled')
+                        values[key] = pickle.loads(values[key])
+                    else:
+                        values[key] = serializer.loads(values[key])
+                return args, kwargs
+
+            def _get_keywords(self):
+                """return the keyword functions by their keyword name"""
+                if self._keywords is None:
+                    self._keywords = {}
+                    for name in self.get_keyword_names():
+                        function = getattr(self._library, name)
+                        self._keywords[
+                            getattr(function, 'robot_name', None) or name
+                        ] = function
+                return self._keywords
+
+            def _is_keyword(self, name):
+                """tell if ``name`` is a keyword of the library"""
+                if not is_dynamic_library(self._library):
+                    return name in self._get_keywords()
+                # the keywords of dynamic libraries are fetched again only
+                # for unknown names, as they may be added later
+                if (self._dynamic_keywords is None or
+                        name not in self._dynamic_keywords):
+                    self._dynamic_keywords = frozenset(
+                        self.get_keyword_names()
+                    )
+                return name in self._dynamic_keywords
+
+            def redirect(self, stdout, stderr,
+                         robotapilogwriter, robotapilogconsole,
+                         robotapilogreplay=None):
+                """install all output sinks of the connection at once
+
+                If ``robotapilogreplay`` is given, ``robot.api.logger``
+                messages are collected and handed over to it in batches
+                instead of calling ``robotapilogwriter`` and
+                ``robotapilogconsole`` for each message.
+                """
+                logbuffer = None
+                if robotapilogreplay is not None:
+                    logbuffer = LogBuffer(log_buffer_size, robotapilogreplay)
+                    robotapilogwriter = logbuffer.write
+                    robotapilogconsole = logbuffer.console
+
+                buffer = None
+                if output_buffer_size > 0:
+                    buffer = OutputBuffer(
+                        output_buffer_size,
+                        output_flush_interval,
+                    )
+                    stdout = BufferedStream(buffer, stdout)
+                    stderr = BufferedStream(buffer, stderr)
+
+                self._redirected.set(self._redirected.get() + (
+                    (
+                        buffer,
+                        logbuffer,
+                        self.stdout,
+                        self.stderr,
+                        self.robotapilogwriter,
+                        self.robotapilogconsole,
+                    ),
+                ))
+                self.stdout = stdout
+                self.stderr = stderr
+                self.robotapilogwriter = robotapilogwriter
+                self.robotapilogconsole = robotapilogconsole
+
+            def install_redirect(self, stdout, stderr,
+                                 robotapilogwriter, robotapilogconsole,
+                                 robotapilogreplay=None):
+                """
+                keep the output sinks of the connection, which keyword
+                calls then switch on by themselves instead of calling
+                ``redirect`` and ``restore`` around each call
+                """
+                self._installed_sinks = (
+                    stdout, stderr, robotapilogwriter, robotapilogconsole,
+                    robotapilogreplay,
+                )
+
+            def restore(self):
+                """restore the output sinks replaced by ``redirect``"""
+                redirected = self._redirected.get()
+                if redirected:
+                    *redirected, (
+                        buffer,
+                        logbuffer,
+                        stdout,
+                        stderr,
+                        robotapilogwriter,
+                        robotapilogconsole,
+                    ) = redirected
+                    self._redirected.set(tuple(redirected))
+                    try:
+                        if buffer is not None:
+                            buffer.flush()
+                    finally:
+                        try:
+                            if logbuffer is not None:
+                                logbuffer.flush()
+                        finally:
+                            self.stdout = stdout
+                            self.stderr = stderr
+                            self.robotapilogwriter = robotapilogwriter
+                            self.robotapilogconsole = robotapilogconsole
+
             @property
             def library(self):
                 """wrapprt to retrieve the library object from remote"""
@@ -384,27 +1525,47 @@ class RPyCRobotRemoteServer:
         )
 
         if timeout is not None:
-            config['sync_request_timeout'] = convert_time(
+            config['sync_request_timeout'] = timestr_to_secs(
                 timeout,
-                result_format='number'
+                round_to=None
             )
         # pylint: enable=duplicate-code
 
+        output_flush_interval = timestr_to_secs(
+            output_flush_interval,
+            round_to=None
+        )
+
+        if serializer is None:
+            serializer = default_serializer
+        self._serializer = serializer
+        statistics = ServerStatistics()
+        self._statistics = statistics
+
         service = classpartial(Service, library)
+        if socket_path is None:
+            self._socket_path = None
+            address = {'hostname': host, 'port': port, 'ipv6': ipv6}
+        else:
+            self._socket_path = pathlib.Path(socket_path).absolute()
+            remove_stale_socket(self._socket_path)
+            address = {'socket_path': str(self._socket_path)}
         self._server = server(
             service,
-            hostname=host,
-            port=port,
-            ipv6=ipv6,
+            **address,
             authenticator=authenticator,
             auto_register=False,
             logger=logger,
             protocol_config=config,
         )
+        if socket_path is not None:
+            # RPyC applies the listener timeout to TCP sockets only, without
+            # it a stopped server would wait for one more connection
+            self._server.listener.settimeout(LISTENER_TIMEOUT)
 
         if serve:
             self.serve()
-    # pylint: enable=R0913,R0914
+    # pylint: enable=R0913,R0914,R0915
 
     def stop(self):
         """stop serving requests"""
@@ -429,6 +1590,18 @@ class RPyCRobotRemoteServer:
             if self._port_file and not isinstance(
                     self._port_file, io.TextIOBase):
                 self._port_file.unlink()
+            if self._socket_path is not None:
+                self._socket_path.unlink(missing_ok=True)
+
+    @property
+    def serializer(self):
+        """Registry of types which keywords return by value."""
+        return self._serializer
+
+    @property
+    def statistics(self):
+        """Statistics of connections, keyword calls and the server class."""
+        return self._statistics.snapshot(self._server)
 
     @property
     def server_address(self):
@@ -440,11 +1613,68 @@ class RPyCRobotRemoteServer:
         """Server port as an integer.
 
         If the initial given port is 0, also this property returns 0 until
-        the server is activated.
+        the server is activated. When listening to a Unix domain socket,
+        its path is returned instead.
         """
         return self._server.port
 
+    @property
+    def socket_path(self):
+        """Path of the Unix domain socket or ``None`` when using TCP."""
+        return self._socket_path
+
+
+def remove_stale_socket(path: pathlib.Path):
+    """
+    remove a Unix domain socket left at ``path`` by a server which was not
+    stopped properly. Sockets still accepting connections and other files
+    are kept, binding to them fails then.
+    """
+    try:
+        if not stat.S_ISSOCK(path.lstat().st_mode):
+            return
+    except FileNotFoundError:
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except ConnectionRefusedError:
+            path.unlink(missing_ok=True)
+
 
 def is_function_or_method(item):
     """return True in case item is a function or method"""
     return inspect.isfunction(item) or inspect.ismethod(item)
+
+
+def is_dynamic_library(library):
+    """return True in case library implements the dynamic library API"""
+    return (callable(getattr(library, 'get_keyword_names', None)) and
+            callable(getattr(library, 'run_keyword', None)))
+
+
+def dynamic_keyword_specification(library, name: str):
+    """
+    return the keyword specification of ``name`` as provided by a library
+    implementing the dynamic library API
+    """
+    def get(method, default=None):
+        method = getattr(library, method, None)
+        if method is None:
+            return default
+        return method(name)
+
+    arguments = get('get_keyword_arguments')
+    if arguments is not None:
+        arguments = tuple(
+            tuple(arg) if isinstance(arg, (list, tuple)) else str(arg)
+            for arg in arguments
+        )
+    return (
+        name,
+        arguments,
+        types_specification(get('get_keyword_types', ())),
+        str(get('get_keyword_documentation', '') or ''),
+        tuple(str(tag) for tag in get('get_keyword_tags', ()) or ()),
+        get('get_keyword_source'),
+    )
@@ -0,0 +1,157 @@
+"""
+Transfer of large binary data through shared memory
+
+When client and server run on the same host, ``bytes``, ``bytearray`` and
+``memoryview`` objects above a size threshold are copied into a shared
+memory segment and only the descriptor ``(name, size, kind)`` is passed
+through the connection instead of the data itself. The receiving party
+copies the data out of the segment and removes it. Segments which were
+never received are removed by the creating party as soon as the
+connection is closed.
+
+Segments only outlive the handle of their creator on POSIX systems, so
+the transfer is not offered elsewhere.
+"""
+import os
+import sys
+import threading
+
+SHARED_MEMORY = 'shared_memory'
+AVAILABLE = os.name == 'posix'
+# number of remembered segments before checking which were received
+PRUNE_SIZE = 64
+
+BUFFER_TYPES = {
+    bytes: 'bytes',
+    bytearray: 'bytearray',
+    memoryview: 'bytes',
+}
+
+
+def shareable(value, threshold: int) -> bool:
+    """return True if ``value`` is binary data of at least ``threshold``"""
+    if type(value) not in BUFFER_TYPES:
+        return False
+    return memoryview(value).nbytes >= threshold
+
+
+def receive(descriptor):
+    """copy the data out of the segment given by ``descriptor``"""
+    name, size, kind = descriptor
+    segment = _open(name)
+    try:
+        with segment.buf[:size] as view:
+            data = bytearray(view) if kind == 'bytearray' else bytes(view)
+    finally:
+        segment.close()
+        _unlink(segment)
+    return data
+
+
+def discard(name: str):
+    """remove segment ``name`` unless it was already received"""
+    try:
+        segment = _open(name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    _unlink(segment)
+
+
+class SharedMemoryTransfer:
+    """
+    Segments created by one party of a connection
+
+    ``available`` tells whether the other party can attach to them, it is
+    ``None`` until this was negotiated. Segments the other party received
+    are forgotten once the remembered ones reach a limit, which is twice
+    the number still outstanding afterwards, but at least ``PRUNE_SIZE``.
+    Checking them thereby costs a constant number of lookups per segment
+    on average.
+    """
+    __slots__ = ('available', '_lock', '_names', '_limit')
+
+    def __init__(self):
+        self.available = None if AVAILABLE else False
+        self._lock = threading.Lock()
+        self._names = set()
+        self._limit = PRUNE_SIZE
+
+    def share(self, value):
+        """copy ``value`` into a new segment and return its descriptor"""
+        view = memoryview(value)
+        if not view.c_contiguous:
+            view = memoryview(view.tobytes())
+        view = view.cast('B')
+        segment = _open(size=max(view.nbytes, 1))
+        try:
+            segment.buf[:view.nbytes] = view
+        except BaseException:
+            segment.close()
+            _unlink(segment)
+            raise
+        segment.close()
+        with self._lock:
+            self._names.add(segment.name)
+            prune = len(self._names) >= self._limit
+            names = tuple(self._names) if prune else ()
+        if prune:
+            self._prune(names)
+        return segment.name, view.nbytes, BUFFER_TYPES[type(value)]
+
+    def _prune(self, names):
+        """forget the segments the other party received and removed"""
+        received = [name for name in names if not _exists(name)]
+        with self._lock:
+            self._names.difference_update(received)
+            self._limit = max(PRUNE_SIZE, 2 * len(self._names))
+
+    def release(self):
+        """remove all segments the other party did not receive"""
+        with self._lock:
+            names, self._names = self._names, set()
+        for name in names:
+            discard(name)
+
+
+def _open(name=None, size=0):
+    """
+    open a segment without the resource tracker, which would remove it
+    once this process exits, even if it is meant for the other party
+    """
+    # multiprocessing is only loaded by processes which share data
+    # pylint: disable=C0415
+    from multiprocessing import resource_tracker, shared_memory
+    # pylint: enable=C0415
+    if sys.version_info >= (3, 13):
+        # pylint: disable=E1123
+        return shared_memory.SharedMemory(
+            name, create=name is None, size=size, track=False
+        )
+        # pylint: enable=E1123
+    segment = shared_memory.SharedMemory(name, create=name is None, size=size)
+    if AVAILABLE:
+        # pylint: disable=W0212
+        resource_tracker.unregister(segment._name, 'shared_memory')
+        # pylint: enable=W0212
+    return segment
+
+
+def _exists(name: str) -> bool:
+    """tell if segment ``name`` was not removed yet"""
+    try:
+        segment = _open(name)
+    except FileNotFoundError:
+        return False
+    segment.close()
+    return True
+
+
+def _unlink(segment):
+    if sys.version_info < (3, 13) and AVAILABLE:
+        from multiprocessing import resource_tracker  # noqa: E501 pylint: disable=C0415
+        # unlink unregisters the segment, which _open already did
+        # pylint: disable=W0212
+        resource_tracker.register(segment._name, 'shared_memory')
+        # pylint: enable=W0212
+    segment.unlink()
@@ -1,12 +1,58 @@
 """
 __init__.py for RPyCRobotRemote
+
+Attributes are imported from their modules on first access, so a process
+using only the client neither loads the server nor gets its streams
+wrapped by it.
 """
-from .RPyCRobotRemoteClient import RPyCRobotRemoteClient as Client
-from .RPyCRobotRemoteServer import (  # noqa: F401
-    RPyCRobotRemoteServer as Server,
-    SingleServer,
-    ThreadedServer,
-)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .RPyCRobotRemoteClient import RPyCRobotRemoteClient as Client
+    from .RPyCRobotRemoteServer import (  # noqa: F401
+        RPyCRobotRemoteServer as Server,
+        PooledServer,
+        PreforkServer,
+        SingleServer,
+        ThreadedServer,
+    )
+    from .RPyCRobotRemoteSerializer import Serializer, serializer  # noqa: F401
+    from .RPyCRobotRemotePool import (  # noqa: F401
+        ConnectionPool,
+        connection_pool,
+    )
+
+    RPyCRobotRemote = Client
+
+_ATTRIBUTES = {
+    'Client': ('RPyCRobotRemoteClient', 'RPyCRobotRemoteClient'),
+    'RPyCRobotRemote': ('RPyCRobotRemoteClient', 'RPyCRobotRemoteClient'),
+    'Server': ('RPyCRobotRemoteServer', 'RPyCRobotRemoteServer'),
+    'PooledServer': ('RPyCRobotRemoteServer', 'PooledServer'),
+    'PreforkServer': ('RPyCRobotRemoteServer', 'PreforkServer'),
+    'SingleServer': ('RPyCRobotRemoteServer', 'SingleServer'),
+    'ThreadedServer': ('RPyCRobotRemoteServer', 'ThreadedServer'),
+    'Serializer': ('RPyCRobotRemoteSerializer', 'Serializer'),
+    'serializer': ('RPyCRobotRemoteSerializer', 'serializer'),
+    'ConnectionPool': ('RPyCRobotRemotePool', 'ConnectionPool'),
+    'connection_pool': ('RPyCRobotRemotePool', 'connection_pool'),
+}
+
+
+def __getattr__(name):
+    try:
+        module, attribute = _ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}'
+        ) from None
+    value = getattr(
+        importlib.import_module(f'.{module}', __name__), attribute
+    )
+    globals()[name] = value
+    return value
 
 
-RPyCRobotRemote = Client
+def __dir__():
+    return sorted(set(globals()) | set(_ATTRIBUTES))
@@ -0,0 +1,27 @@
+"""
+Library capturing what Robot Framework writes to the console
+"""
+import io
+import sys
+
+
+class ConsoleCapture:
+    """
+    Replaces ``sys.__stdout__``, to which messages for the console are
+    written, while capturing
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self):
+        self._original = None
+
+    def start_console_capture(self):
+        """capture the console output until `Stop Console Capture`"""
+        self._original = sys.__stdout__
+        sys.__stdout__ = io.StringIO()
+
+    def stop_console_capture(self):
+        """stop capturing and return the captured console output"""
+        captured, sys.__stdout__ = sys.__stdout__, self._original
+        return captured.getvalue()
@@ -2,6 +2,7 @@
 Sample service Provide() used for testing RPyCRobot client and server
 """
 from pydantic import BaseModel, field_validator
+import RPyCRobotRemote
 
 
 class DummyModel(BaseModel):
@@ -25,6 +26,9 @@ class DummyModel(BaseModel):
         return 'method'
 
 
+RPyCRobotRemote.serializer.register(DummyModel)
+
+
 class Model:
     """dummy test implementation"""
 
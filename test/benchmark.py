@@ -0,0 +1,461 @@
+"""
+Benchmarks for the hot paths of RPyCRobotRemote client and server
+
+Starts servers in separate processes on the loopback interface or on
+a Unix domain socket and measures them through ``RPyCRobotRemote.Client``.
+Results are printed and can be written as JSON to compare different
+versions::
+
+    python test/benchmark.py --output new.json --compare old.json
+"""
+import argparse
+import contextlib
+import functools
+import io
+import itertools
+import json
+import os
+import pathlib
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+from importlib import metadata
+import rpyc
+from robot.version import get_version as get_robot_version
+import RPyCRobotRemote
+
+SERVERS = ('SingleServer', 'ThreadedServer', 'PooledServer')
+TRANSPORTS = ('tcp', 'unix') if hasattr(socket, 'AF_UNIX') else ('tcp', )
+
+# Robot Framework itself is loaded before libraries are imported
+IMPORT_CLIENT = '''
+import json, sys, time
+import robot.running
+stdout = sys.stdout
+start = time.perf_counter()
+import RPyCRobotRemote
+RPyCRobotRemote.Client
+print(json.dumps({
+    'duration': time.perf_counter() - start,
+    'server_loaded': 'RPyCRobotRemote.RPyCRobotRemoteServer' in sys.modules,
+    'streams_wrapped': sys.stdout is not stdout,
+}))
+'''
+
+
+class BenchmarkLibrary:
+    """library hosted by the benchmark servers"""
+
+    def noop(self):
+        """keyword doing nothing"""
+
+    def print_lines(self, count: int, width: int = 79):
+        """keyword printing ``count`` lines"""
+        line = 'x' * width
+        for _ in range(count):
+            print(line)
+
+    def make_list(self, size: int):
+        """keyword returning a list of ``size`` integers"""
+        return list(range(size))
+
+    def make_dict(self, size: int):
+        """keyword returning a dictionary with ``size`` items"""
+        return {f'key{i}': i for i in range(size)}
+
+    def make_records(self, size: int):
+        """keyword returning a list of ``size`` dictionaries"""
+        return [{'index': i, 'name': f'record{i}', 'values': [i, i + 1]}
+                for i in range(size)]
+
+
+def serve(server, port_file, by_value, socket_path=None):
+    """run a benchmark server until it is stopped remotely"""
+    serializer = RPyCRobotRemote.Serializer()
+    if by_value:
+        serializer.register(list)
+        serializer.register(dict)
+    RPyCRobotRemote.Server(
+        BenchmarkLibrary(),
+        port=0,
+        port_file=port_file,
+        socket_path=socket_path,
+        server=getattr(RPyCRobotRemote, server),
+        serializer=serializer,
+    )
+
+
+@contextlib.contextmanager
+def running_server(server, transport='tcp', by_value=False):
+    """start a server process and yield the arguments to connect to it"""
+    with tempfile.TemporaryDirectory() as directory:
+        port_file = pathlib.Path(directory) / 'port'
+        socket_path = pathlib.Path(directory) / 'socket'
+        # pylint: disable=R1732
+        process = subprocess.Popen(
+            [sys.executable, __file__, '--serve', server,
+             '--port-file', str(port_file)] +
+            (['--socket-path', str(socket_path)]
+             if transport == 'unix' else []) +
+            (['--by-value'] if by_value else []),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        # pylint: enable=R1732
+        try:
+            deadline = time.monotonic() + 30
+            while not port_file.exists() or not port_file.read_text():
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f'{server} did not start')
+                time.sleep(0.05)
+            if transport == 'unix':
+                yield {'socket_path': port_file.read_text().strip()}
+            else:
+                yield {'port': int(port_file.read_text())}
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def connect(address, **kwargs):
+    """return a client forwarding output as within Robot Framework"""
+    client = RPyCRobotRemote.Client('localhost', **address, **kwargs)
+    # pylint: disable=W0212
+    # outside of Robot Framework the import is never reported as complete
+    client._client._is_redirected = False
+    if client._client._serving is not None:
+        client._client._serving.release()
+    # pylint: enable=W0212
+    return client
+
+
+def disconnect(client):
+    """close the connection of ``client``"""
+    client._disconnect()  # pylint: disable=W0212
+
+
+def summary(samples):
+    """return the distribution of ``samples`` in seconds"""
+    samples = sorted(samples)
+    if len(samples) > 1:
+        percentiles = statistics.quantiles(samples, n=100, method='inclusive')
+    else:
+        percentiles = samples * 99
+    return {
+        'samples': len(samples),
+        'min': samples[0],
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'p90': percentiles[89],
+        'p99': percentiles[98],
+        'max': samples[-1],
+    }
+
+
+def timed(function, repeat):
+    """return the durations of calling ``function`` ``repeat`` times"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_import(repeat):
+    """time to import the client in a fresh Robot Framework process"""
+    samples = []
+    for _ in range(repeat):
+        result = json.loads(subprocess.run(
+            [sys.executable, '-c', IMPORT_CLIENT],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout)
+        samples.append(result.pop('duration'))
+    return {**summary(samples), **result}
+
+
+def bench_stream_write(writes):
+    """
+    time per write to the thread specific ``sys.stdout`` of a server, for
+    threads without and with a redirected stream, compared to writing to
+    the stream directly and through the generic wrapper
+    """
+    # importing the server replaces the streams of this process
+    # pylint: disable=C0415
+    from RPyCRobotRemote.RPyCRobotRemoteServer import (
+        ThreadSpecificStream,
+        WrapTheadSpecific,
+    )
+    # pylint: enable=C0415
+    with open(os.devnull, 'w', encoding='utf-8') as target:
+        def measure(stream):
+            return min(timeit.repeat(
+                lambda: stream.write('x'), number=writes, repeat=5
+            )) / writes
+
+        wrapper = ThreadSpecificStream(target)
+        result = {
+            'raw': measure(target),
+            'generic': measure(WrapTheadSpecific(target)),
+            'default': measure(wrapper),
+        }
+        wrapper.set_thread_specific_instance(target)
+        result['redirected'] = measure(wrapper)
+    result['overhead'] = result['default'] - result['raw']
+    return result
+
+
+def bench_connect(address, repeat):
+    """time to connect and disconnect a client"""
+    return summary(timed(lambda: disconnect(connect(address)), repeat))
+
+
+def bench_discovery(address, repeat):
+    """time to import a library and fetch all keyword information"""
+    def discover():
+        client = connect(address)
+        for name in client.get_keyword_names():
+            client.get_keyword_arguments(name)
+            client.get_keyword_documentation(name)
+        disconnect(client)
+    return summary(timed(discover, repeat))
+
+
+def bench_call_latency(address, repeat):
+    """round trip time of a keyword call without arguments and result"""
+    client = connect(address)
+    try:
+        client.run_keyword('noop', ())
+        return summary(timed(lambda: client.run_keyword('noop', ()), repeat))
+    finally:
+        disconnect(client)
+
+
+def bench_output(address, repeat, lines=5000):
+    """throughput of output forwarded from the server"""
+    client = connect(address)
+    try:
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            samples = timed(
+                lambda: client.run_keyword('print_lines', (lines, )),
+                repeat,
+            )
+        result = summary(samples)
+        result['lines_per_second'] = lines / result['median']
+        result['bytes_per_second'] = len(stdout.getvalue()) / repeat / (
+            result['median']
+        )
+        return result
+    finally:
+        disconnect(client)
+
+
+def bench_marshalling(address, repeat, keyword, size):
+    """time to return a large structure and convert it to local objects"""
+    serializer = RPyCRobotRemote.Serializer()
+    serializer.register(list)
+    serializer.register(dict)
+    client = connect(address, serializer=serializer)
+
+    def materialize(value):
+        # netrefs pass isinstance checks of the remote type
+        if isinstance(value, dict):
+            return {key: materialize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [materialize(item) for item in value]
+        return value
+
+    try:
+        return summary(timed(
+            lambda: materialize(client.run_keyword(keyword, (size, ))),
+            repeat,
+        ))
+    finally:
+        disconnect(client)
+
+
+def bench_concurrency(address, clients, calls):
+    """keyword calls per second with several clients calling at once"""
+    barrier = threading.Barrier(clients + 1)
+    errors = []
+
+    def work():
+        try:
+            client = connect(address)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            errors.append(e)
+            barrier.abort()
+            return
+        try:
+            barrier.wait()
+            for _ in range(calls):
+                client.run_keyword('noop', ())
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            errors.append(e)
+        finally:
+            disconnect(client)
+
+    threads = [threading.Thread(target=work) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    try:
+        barrier.wait(timeout=60)
+    except threading.BrokenBarrierError:
+        pass
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return {
+        'clients': clients,
+        'calls': clients * calls,
+        'duration': duration,
+        'calls_per_second': clients * calls / duration,
+    }
+
+
+def run(arguments):
+    """run all benchmarks selected by ``arguments``"""
+    scale = 0.1 if arguments.quick else 1
+    repeat = int(1000 * scale)
+    size = int(1000 * scale)
+    results = []
+
+    def record(benchmark, result, **parameters):
+        result = {'benchmark': benchmark, **parameters, **result}
+        results.append(result)
+        print(json.dumps(result), file=sys.stderr)
+
+    record('import', bench_import(repeat // 50))
+    record('stream_write', bench_stream_write(repeat * 100))
+    for server, transport in itertools.product(arguments.servers,
+                                               arguments.transports):
+        measure = functools.partial(record, server=server,
+                                    transport=transport)
+
+        with running_server(server, transport) as address:
+            measure('connect', bench_connect(address, repeat // 10))
+            measure('discovery', bench_discovery(address, repeat // 50))
+            measure('call_latency', bench_call_latency(address, repeat))
+            measure('output', bench_output(address, 5), lines=5000)
+            if server != 'SingleServer':
+                # a single server serves concurrent clients one by one
+                measure('concurrency', bench_concurrency(
+                    address, arguments.clients, repeat // 10
+                ))
+            for keyword in ('make_list', 'make_dict', 'make_records'):
+                # every item of a netref costs round trips, so repeat less
+                measure('marshalling',
+                        bench_marshalling(address, 1, keyword, size),
+                        keyword=keyword, size=size, by_value=False)
+
+        with running_server(server, transport, by_value=True) as address:
+            for keyword in ('make_list', 'make_dict', 'make_records'):
+                measure('marshalling',
+                        bench_marshalling(address, 5, keyword, size),
+                        keyword=keyword, size=size, by_value=True)
+
+    return {
+        'metadata': {
+            'version': version(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'robotframework': get_robot_version(),
+            'rpyc': rpyc.__version__,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': results,
+    }
+
+
+def version():
+    """return the version of RPyCRobotRemote being measured"""
+    try:
+        return metadata.version('robotframework-rpycremote')
+    except metadata.PackageNotFoundError:
+        pass
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'],
+            cwd=pathlib.Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def key(result):
+    """identify a result independent from the measured values"""
+    return tuple(
+        (name, result[name]) for name in (
+            'benchmark', 'server', 'transport', 'keyword', 'by_value'
+        ) if name in result
+    )
+
+
+def compare(current, baseline):
+    """print the ratio of the current to the baseline results"""
+    measured = {key(result): result for result in baseline['results']}
+    print(f'compared to version {baseline["metadata"]["version"]}:')
+    for result in current['results']:
+        base = measured.get(key(result))
+        if base is None:
+            continue
+        name = next(name for name in ('calls_per_second', 'median', 'default')
+                    if name in result)
+        ratio = result[name] / base[name]
+        label = ' '.join(str(value) for _, value in key(result))
+        print(f'  {label:<50} {name:<16} {ratio:6.2f}x')
+
+
+def main():
+    """command line interface"""
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n\n', maxsplit=1)[0]
+    )
+    parser.add_argument('--output', type=pathlib.Path,
+                        help='write results as JSON to this file')
+    parser.add_argument('--compare', type=pathlib.Path,
+                        help='JSON results of a previous run to compare to')
+    parser.add_argument('--servers', nargs='+', default=SERVERS,
+                        choices=SERVERS, help='server classes to measure')
+    parser.add_argument('--transports', nargs='+', default=TRANSPORTS,
+                        choices=TRANSPORTS, help='transports to measure')
+    parser.add_argument('--clients', type=int, default=8,
+                        help='number of concurrent clients')
+    parser.add_argument('--quick', action='store_true',
+                        help='fewer repetitions and smaller structures')
+    parser.add_argument('--serve', choices=SERVERS, help=argparse.SUPPRESS)
+    parser.add_argument('--port-file', help=argparse.SUPPRESS)
+    parser.add_argument('--socket-path', help=argparse.SUPPRESS)
+    parser.add_argument('--by-value', action='store_true',
+                        help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.serve:
+        serve(arguments.serve, arguments.port_file, arguments.by_value,
+              arguments.socket_path)
+        return
+
+    results = run(arguments)
+    if arguments.output:
+        arguments.output.write_text(json.dumps(results, indent=2) + os.linesep)
+    if arguments.compare:
+        compare(results, json.loads(arguments.compare.read_text()))
+
+
+if __name__ == '__main__':
+    main()
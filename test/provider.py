@@ -1,6 +1,8 @@
 """
 Sample service Provide() used for testing RPyCRobot client and server
 """
+import asyncio
+import enum
 from typing import Set
 from robot.api import logger
 from robot.api.deco import keyword, not_keyword
@@ -36,7 +38,13 @@ class Region:
         )
 
 
-class Provider:
+class Color(enum.Enum):
+    """Color enumeration, which is unknown to the client"""
+    RED = 1
+    GREEN = 2
+
+
+class Provider:  # pylint: disable=R0904
     """dummy test implementation"""
     ROBOT_LIBRARY_DOC_FORMAT = 'text'
 
@@ -89,6 +97,42 @@ class Provider:
         """help_method sample non keyword"""
         print('should not be existing')
 
+    @staticmethod
+    def log_to_console():
+        """keyword which logs messages also written to the console"""
+        logger.info('info message also to console', also_console=True)
+        logger.write('message with console level', 'CONSOLE')
+        logger.warn('warning message')
+
+    @staticmethod
+    @keyword(types={'n': int})
+    def typed_argument(n):
+        """keyword with argument type given by name, returns its type"""
+        return type(n).__name__
+
+    @staticmethod
+    @keyword(types=[int])
+    def positionally_typed_argument(n):
+        """keyword with argument type given by position, returns its type"""
+        return type(n).__name__
+
+    @staticmethod
+    @keyword(types=None)
+    def untyped_argument(n: int):
+        """keyword without argument conversion, returns the argument type"""
+        return type(n).__name__
+
+    @staticmethod
+    def enum_argument(color: Color, n: int = 0):
+        """keyword with argument of a library enum, returns the types"""
+        return f'{type(color).__name__} {type(n).__name__}'
+
+    @staticmethod
+    @keyword(types=[Color, int])
+    def positionally_enum_argument(color, n=0):
+        """keyword with enum argument type given by position"""
+        return f'{type(color).__name__} {type(n).__name__}'
+
     @keyword(name='Use Other Name')
     def renamed_keyword(self):
         """sample renmaed keyword"""
@@ -111,6 +155,44 @@ class Provider:
         """keyword which return a region"""
         return {"first": 1, "second": 2}
 
+    def echo(self, value):
+        """keyword which returns its argument"""
+        return value
+
+    def get_model(self, value: int = 3):
+        """keyword which returns a model registered on both parties"""
+        return DummyModel(value=value)
+
+    def get_cyclic_dictionary(self):
+        """keyword which returns a dictionary referencing itself"""
+        cyclic = {'name': 'cyclic'}
+        cyclic['self'] = cyclic
+        return cyclic
+
+    def print_lines(self, count: int = 1000):
+        """keyword which prints many lines"""
+        for i in range(count):
+            print(f'line {i}')
+
+    def get_blob(self, size: int = 1048576):
+        """keyword which returns binary data"""
+        return bytes(range(256)) * (size // 256)
+
+    def blob_length(self, data):
+        """keyword which returns the length of binary data"""
+        return len(data)
+
+    def generate_lines(self, count: int = 1000):
+        """keyword which returns a generator of lines"""
+        return (f'line {i}' for i in range(count))
+
+    async def wait_and_print(self, delay: float = 0.1):
+        """coroutine keyword which prints before and after waiting"""
+        print('before waiting')
+        await asyncio.sleep(delay)
+        logger.info('after waiting')
+        return delay
+
     def raise_error(self):
         """keyword which raises an error"""
         raise RuntimeError('error')
@@ -123,6 +205,9 @@ class Provider:
         """keyword which returns an object"""
         return self.Dummy()
 
+    @keyword(tags=['rpyc:arguments-by-value'])
     def model_test(self, model: DummyModel):
-        """keyword which returns an object"""
+        """keyword which receives an object by value"""
+        # netrefs pass isinstance checks, so compare the type itself
+        assert type(model) is DummyModel, 'not passed by value'  # noqa: E501 pylint: disable=C0123
         return model.value
@@ -5,7 +5,7 @@ import sys
 import logging
 import logging.config
 import yaml
-from provider import Provider
+from provider import Provider, Region
 import RPyCRobotRemote
 
 LOGCONFIG = """
@@ -37,12 +37,19 @@ logging.config.dictConfig(
 )
 
 
+RPyCRobotRemote.serializer.register(dict)
+RPyCRobotRemote.serializer.register(Region)
+
+# optional arguments: port or Unix socket path and name of the server class
+address = sys.argv[1] if len(sys.argv) > 1 else '18861'
 server = RPyCRobotRemote.Server(
     Provider(),
     serve=False,
-    # port=0,
+    **({'port': int(address)} if address.isdigit()
+       else {'socket_path': address}),
     port_file=sys.stdout,
-    server=RPyCRobotRemote.SingleServer
+    server=getattr(RPyCRobotRemote, sys.argv[2] if len(sys.argv) > 2
+                   else 'SingleServer')
 )
 
 server.serve()